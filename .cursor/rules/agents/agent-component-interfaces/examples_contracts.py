@@ -5,8 +5,10 @@ This file demonstrates input/output contract definitions and validation patterns
 Reference this example from RULE.mdc using @examples_contracts.py syntax.
 """
 
-from typing import List, Dict, Any, Optional, Tuple
-from pydantic import BaseModel, Field, validator
+from enum import IntEnum
+from typing import List, Dict, Any, Optional, Tuple, Literal, Annotated, Union
+from typing_extensions import TypedDict
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
 from dataclasses import dataclass
 
 
@@ -14,18 +16,28 @@ from dataclasses import dataclass
 # Contract Data Models (Pydantic)
 # ============================================================================
 
+# Contracts outside the ContractValidationService hot path (ActionEvaluation,
+# Experience, Feedback, ActionResult) use defer_build=True so their core schema
+# is only built on first use rather than at import.
+
+# Shared once at module level so every schema that references a risk level
+# reuses the same literal validator instead of declaring its own constraint.
+RiskLevel = Literal["low", "medium", "high", "critical"]
+
+
+class CostEstimate(TypedDict):
+    """Known cost estimate shape (typing_extensions.TypedDict for Pydantic on Python < 3.12)."""
+    # Extra keys (e.g. "usd") are kept, as they were when this was Dict[str, Any]
+    __pydantic_config__ = ConfigDict(extra="allow")
+    
+    tokens: int
+
+
 class UserRequest(BaseModel):
     """User request contract with validation."""
-    request_id: str = Field(..., description="Unique request identifier")
+    request_id: str = Field(..., description="Unique request identifier", min_length=3)
     content: str = Field(..., description="User request content", min_length=1)
     context: Dict[str, Any] = Field(default_factory=dict, description="Request context")
-    
-    @validator('request_id')
-    def validate_request_id(cls, v):
-        """Validate request ID format."""
-        if not v or len(v) < 3:
-            raise ValueError("Request ID must be at least 3 characters")
-        return v
 
 
 class PlanningContext(BaseModel):
@@ -39,23 +51,19 @@ class PlanningContext(BaseModel):
 class StrategicPlan(BaseModel):
     """Strategic plan contract with validation."""
     plan_id: str = Field(..., description="Plan identifier")
-    goals: List[str] = Field(..., description="List of goals", min_items=1)
-    action_sequence: List[str] = Field(..., description="Action sequence", min_items=1)
+    # Each goal must contain a non-whitespace character; checked in pydantic-core
+    goals: List[Annotated[str, Field(pattern=r"\S")]] = Field(..., description="List of goals", min_length=1)
+    action_sequence: List[str] = Field(..., description="Action sequence", min_length=1)
     risk_assessments: List[Dict[str, Any]] = Field(default_factory=list, description="Risk assessments")
-    
-    @validator('goals')
-    def validate_goals(cls, v):
-        """Validate goals are not empty."""
-        if not v or any(not goal.strip() for goal in v):
-            raise ValueError("Goals must be non-empty strings")
-        return v
 
 
 class ActionEvaluation(BaseModel):
     """Action evaluation contract with validation."""
+    model_config = ConfigDict(defer_build=True)
+    
     action_id: str = Field(..., description="Action identifier")
-    risk_level: str = Field(..., description="Risk level", regex="^(low|medium|high|critical)$")
-    cost_estimate: Dict[str, Any] = Field(..., description="Cost estimate")
+    risk_level: RiskLevel = Field(..., description="Risk level")
+    cost_estimate: CostEstimate = Field(..., description="Cost estimate")
     benefit_score: float = Field(..., description="Benefit score", ge=0.0, le=1.0)
     recommendation: bool = Field(..., description="Recommendation flag")
 
@@ -69,8 +77,10 @@ class MemoryContext(BaseModel):
 
 class Experience(BaseModel):
     """Experience contract with validation."""
+    model_config = ConfigDict(defer_build=True)
+    
     experience_id: str = Field(..., description="Experience identifier")
-    actions: List[Dict[str, Any]] = Field(..., description="Actions taken", min_items=1)
+    actions: List[Dict[str, Any]] = Field(..., description="Actions taken", min_length=1)
     context: Dict[str, Any] = Field(..., description="Context when actions occurred")
     results: Dict[str, Any] = Field(..., description="Results of actions")
     success: bool = Field(..., description="Success indicator")
@@ -78,10 +88,12 @@ class Experience(BaseModel):
 
 class Feedback(BaseModel):
     """Feedback contract with validation."""
+    model_config = ConfigDict(defer_build=True)
+    
     feedback_id: str = Field(..., description="Feedback identifier")
-    insights: List[str] = Field(..., description="Insights", min_items=0)
-    patterns: List[str] = Field(..., description="Patterns", min_items=0)
-    recommendations: List[str] = Field(..., description="Recommendations", min_items=0)
+    insights: List[str] = Field(..., description="Insights", min_length=0)
+    patterns: List[str] = Field(..., description="Patterns", min_length=0)
+    recommendations: List[str] = Field(..., description="Recommendations", min_length=0)
     confidence: float = Field(..., description="Confidence score", ge=0.0, le=1.0)
 
 
@@ -102,16 +114,55 @@ class ConcreteAction(BaseModel):
 
 class ActionResult(BaseModel):
     """Action result contract with validation."""
+    model_config = ConfigDict(defer_build=True)
+    
     action_id: str = Field(..., description="Action identifier")
     success: bool = Field(..., description="Success indicator")
     result_data: Dict[str, Any] = Field(..., description="Result data")
     error: Optional[str] = Field(None, description="Error message if failed")
 
 
+class _MemoryRow(BaseModel):
+    """
+    Minimal shape every Memory Node output row must satisfy.
+    
+    Stricter than a presence check: memory_id and content must be non-empty
+    strings and relevance_score a number (None is rejected).
+    """
+    memory_id: str = Field(..., min_length=1)
+    content: str = Field(..., min_length=1)
+    relevance_score: float
+
+
+# ============================================================================
+# Cached Type Adapters
+# ============================================================================
+
+# Built once at import so each validation dispatches straight to pydantic-core
+# instead of going through BaseModel.__init__ and kwargs unpacking per call.
+_USER_REQUEST_TA = TypeAdapter(UserRequest)
+_PLANNING_CONTEXT_TA = TypeAdapter(PlanningContext)
+_STRATEGIC_PLAN_TA = TypeAdapter(StrategicPlan)
+_MEMORY_CONTEXT_TA = TypeAdapter(MemoryContext)
+_EXECUTION_CONTEXT_TA = TypeAdapter(ExecutionContext)
+_ACTIONS_TA = TypeAdapter(List[ConcreteAction])
+_MEMORIES_TA = TypeAdapter(List[_MemoryRow])
+
+
 # ============================================================================
 # Contract Validation Service
 # ============================================================================
 
+class ContractKind(IntEnum):
+    """Contract boundary; the value indexes ContractValidationService._SCHEMAS."""
+    PLANNER_INPUT = 0
+    PLANNER_OUTPUT = 1
+    MEMORY_INPUT = 2
+    MEMORY_OUTPUT = 3
+    EXECUTOR_INPUT = 4
+    EXECUTOR_OUTPUT = 5
+
+
 class ContractValidationService:
     """
     Service for validating input/output contracts.
@@ -120,9 +171,52 @@ class ContractValidationService:
     - Input validation at interface boundary
     - Output validation before returning
     - Pydantic model validation
-    - Error handling for invalid contracts
+    - Structured ValidationError propagation for invalid contracts
+    - Table-driven dispatch (one validation routine for every boundary)
     """
     
+    # One adapter per payload, indexed by ContractKind
+    _SCHEMAS: Tuple[Tuple[TypeAdapter, ...], ...] = (
+        (_USER_REQUEST_TA, _PLANNING_CONTEXT_TA),
+        (_STRATEGIC_PLAN_TA,),
+        (_MEMORY_CONTEXT_TA,),
+        (_MEMORIES_TA,),
+        (_STRATEGIC_PLAN_TA, _EXECUTION_CONTEXT_TA),
+        (_ACTIONS_TA,),
+    )
+    
+    def _validate(self, kind: ContractKind, *payloads: Any,
+                  from_json: bool = False) -> Tuple[Any, ...]:
+        """
+        Validate payloads against the adapters registered for a contract kind.
+        
+        ValidationError is deliberately not caught and re-wrapped: it already
+        names the failing model and field paths, it subclasses ValueError, and
+        its message is only rendered if a caller asks for it. Use
+        e.errors(include_url=False) for structured, cheap error details.
+        
+        Args:
+            kind: Contract boundary being validated
+            *payloads: Raw payloads, in the order of the kind's adapters
+            from_json: Payloads are raw JSON (str/bytes) to parse and validate in one pass
+            
+        Returns:
+            Validated objects, one per payload
+            
+        Raises:
+            pydantic.ValidationError: If validation fails (a ValueError subclass)
+        """
+        adapters = self._SCHEMAS[kind]
+        if from_json:
+            return tuple(
+                adapter.validate_json(payload)
+                for adapter, payload in zip(adapters, payloads)
+            )
+        return tuple(
+            adapter.validate_python(payload)
+            for adapter, payload in zip(adapters, payloads)
+        )
+    
     def validate_planner_input(self, user_request: Dict[str, Any], 
                               context: Dict[str, Any]) -> tuple[UserRequest, PlanningContext]:
         """
@@ -136,14 +230,32 @@ class ContractValidationService:
             Validated UserRequest and PlanningContext
             
         Raises:
-            ValueError: If validation fails
+            pydantic.ValidationError: If validation fails (a ValueError subclass)
+        """
+        return self._validate(ContractKind.PLANNER_INPUT, user_request, context)
+    
+    def validate_planner_input_json(self, user_request: bytes,
+                                    context: bytes) -> Tuple[UserRequest, PlanningContext]:
+        """
+        Validate Planner input contracts straight from raw JSON.
+        
+        Prefer this at IO boundaries (e.g. an HTTP body): pydantic-core parses
+        and validates in one pass, which is faster than json.loads followed by
+        validate_planner_input. Callers should keep the raw bytes rather than
+        pre-parsing them.
+        
+        Args:
+            user_request: User request JSON
+            context: Planning context JSON
+            
+        Returns:
+            Validated UserRequest and PlanningContext
+            
+        Raises:
+            pydantic.ValidationError: If parsing or validation fails (a ValueError subclass)
         """
-        try:
-            validated_request = UserRequest(**user_request)
-            validated_context = PlanningContext(**context)
-            return validated_request, validated_context
-        except Exception as e:
-            raise ValueError(f"Invalid Planner input: {str(e)}")
+        return self._validate(ContractKind.PLANNER_INPUT, user_request, context,
+                              from_json=True)
     
     def validate_planner_output(self, plan: Dict[str, Any]) -> StrategicPlan:
         """
@@ -156,13 +268,9 @@ class ContractValidationService:
             Validated StrategicPlan
             
         Raises:
-            ValueError: If validation fails
+            pydantic.ValidationError: If validation fails (a ValueError subclass)
         """
-        try:
-            validated_plan = StrategicPlan(**plan)
-            return validated_plan
-        except Exception as e:
-            raise ValueError(f"Invalid Planner output: {str(e)}")
+        return self._validate(ContractKind.PLANNER_OUTPUT, plan)[0]
     
     def validate_memory_input(self, context: Dict[str, Any]) -> MemoryContext:
         """
@@ -175,13 +283,9 @@ class ContractValidationService:
             Validated MemoryContext
             
         Raises:
-            ValueError: If validation fails
+            pydantic.ValidationError: If validation fails (a ValueError subclass)
         """
-        try:
-            validated_context = MemoryContext(**context)
-            return validated_context
-        except Exception as e:
-            raise ValueError(f"Invalid Memory Node input: {str(e)}")
+        return self._validate(ContractKind.MEMORY_INPUT, context)[0]
     
     def validate_memory_output(self, memories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -194,40 +298,35 @@ class ContractValidationService:
             Validated memories
             
         Raises:
-            ValueError: If validation fails
-        """
-        # Validate each memory has required fields
-        for memory in memories:
-            if not memory.get("memory_id"):
-                raise ValueError("Memory must have memory_id")
-            if not memory.get("content"):
-                raise ValueError("Memory must have content")
-            if "relevance_score" not in memory:
-                raise ValueError("Memory must have relevance_score")
-        
+            pydantic.ValidationError: If validation fails (a ValueError subclass),
+                including a non-string memory_id/content or a None or
+                non-numeric relevance_score (see _MemoryRow)
+        """
+        # Check required fields for the whole batch; the raw rows are returned
+        self._validate(ContractKind.MEMORY_OUTPUT, memories)
         return memories
     
-    def validate_executor_input(self, plan: Dict[str, Any], 
+    def validate_executor_input(self, plan: Union[StrategicPlan, Dict[str, Any]], 
                                context: Dict[str, Any]) -> Tuple[StrategicPlan, ExecutionContext]:
         """
         Validate Executor input contracts.
         
+        Pass the StrategicPlan returned by validate_planner_output straight
+        through instead of dumping it back to a dict: pydantic returns an
+        existing model instance as-is (revalidate_instances="never"), so the
+        Planner -> Executor hand-off validates the plan only once.
+        
         Args:
-            plan: Strategic plan data
+            plan: Strategic plan data, or an already validated StrategicPlan
             context: Execution context data
             
         Returns:
             Validated StrategicPlan and ExecutionContext
             
         Raises:
-            ValueError: If validation fails
+            pydantic.ValidationError: If validation fails (a ValueError subclass)
         """
-        try:
-            validated_plan = StrategicPlan(**plan)
-            validated_context = ExecutionContext(**context)
-            return validated_plan, validated_context
-        except Exception as e:
-            raise ValueError(f"Invalid Executor input: {str(e)}")
+        return self._validate(ContractKind.EXECUTOR_INPUT, plan, context)
     
     def validate_executor_output(self, actions: List[Dict[str, Any]]) -> List[ConcreteAction]:
         """
@@ -240,14 +339,22 @@ class ContractValidationService:
             Validated ConcreteActions
             
         Raises:
-            ValueError: If validation fails
-        """
-        validated_actions = []
-        for action_data in actions:
-            try:
-                validated_action = ConcreteAction(**action_data)
-                validated_actions.append(validated_action)
-            except Exception as e:
-                raise ValueError(f"Invalid action in Executor output: {str(e)}")
+            pydantic.ValidationError: If validation fails (a ValueError subclass);
+                use failed_action_indices() to isolate the offending actions
+        """
+        # The whole list is validated in one call so pydantic-core iterates in Rust
+        return self._validate(ContractKind.EXECUTOR_OUTPUT, actions)[0]
+    
+    @staticmethod
+    def failed_action_indices(error: ValidationError) -> List[int]:
+        """
+        Map a validate_executor_output error back to the failing actions.
         
-        return validated_actions
+        Args:
+            error: ValidationError raised by validate_executor_output
+            
+        Returns:
+            Sorted indices of the actions that failed validation
+        """
+        details = error.errors(include_url=False, include_input=False, include_context=False)
+        return sorted({d["loc"][0] for d in details if d["loc"] and isinstance(d["loc"][0], int)})
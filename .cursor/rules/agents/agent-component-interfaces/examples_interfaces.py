@@ -6,41 +6,32 @@ Reference this example from RULE.mdc using @examples_interfaces.py syntax.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any
 from dataclasses import dataclass
 
+# Contract types are defined once, as Pydantic models, in examples_contracts.py
+from examples_contracts import (
+    UserRequest,
+    PlanningContext,
+    StrategicPlan,
+    ActionEvaluation,
+    MemoryContext,
+    Experience,
+    Feedback,
+    ExecutionContext,
+    ConcreteAction,
+    ActionResult,
+)
+
 
 # ============================================================================
 # Interface Data Types
 # ============================================================================
 
-@dataclass
-class UserRequest:
-    """User request structure."""
-    request_id: str
-    content: str
-    context: Dict[str, Any]
-
-
-@dataclass
-class PlanningContext:
-    """Planning context structure."""
-    user_id: str
-    available_resources: List[str]
-    constraints: Dict[str, Any]
-    historical_context: Optional[Dict[str, Any]] = None
-
-
-@dataclass
-class StrategicPlan:
-    """Strategic plan structure."""
-    plan_id: str
-    goals: List[str]
-    action_sequence: List[str]
-    risk_assessments: List[Dict[str, Any]]
-
+# Interface-only types that have no boundary contract. slots=True (Python 3.10+)
+# drops the per-instance __dict__.
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     """Action structure."""
     action_id: str
@@ -48,17 +39,7 @@ class Action:
     parameters: Dict[str, Any]
 
 
-@dataclass
-class ActionEvaluation:
-    """Action evaluation structure."""
-    action_id: str
-    risk_level: str
-    cost_estimate: Dict[str, Any]
-    benefit_score: float
-    recommendation: bool
-
-
-@dataclass
+@dataclass(slots=True)
 class Goals:
     """Goals structure."""
     main_goals: List[str]
@@ -66,15 +47,7 @@ class Goals:
     constraints: List[str]
 
 
-@dataclass
-class MemoryContext:
-    """Memory context structure."""
-    user_id: str
-    query: str
-    top_k: int = 5
-
-
-@dataclass
+@dataclass(slots=True)
 class Memory:
     """Memory structure."""
     memory_id: str
@@ -83,53 +56,7 @@ class Memory:
     metadata: Dict[str, Any]
 
 
-@dataclass
-class Experience:
-    """Experience structure."""
-    experience_id: str
-    actions: List[Dict[str, Any]]
-    context: Dict[str, Any]
-    results: Dict[str, Any]
-    success: bool
-
-
-@dataclass
-class Feedback:
-    """Feedback structure."""
-    feedback_id: str
-    insights: List[str]
-    patterns: List[str]
-    recommendations: List[str]
-    confidence: float
-
-
-@dataclass
-class ExecutionContext:
-    """Execution context structure."""
-    user_id: str
-    available_workers: List[str]
-    resource_limits: Dict[str, Any]
-
-
-@dataclass
-class ConcreteAction:
-    """Concrete action structure."""
-    action_id: str
-    action_type: str
-    parameters: Dict[str, Any]
-    dependencies: List[str]
-
-
-@dataclass
-class ActionResult:
-    """Action result structure."""
-    action_id: str
-    success: bool
-    result_data: Dict[str, Any]
-    error: Optional[str] = None
-
-
-@dataclass
+@dataclass(slots=True)
 class ExecutionStatus:
     """Execution status structure."""
     status: str
@@ -400,14 +327,13 @@ class BasicExecutor(IExecutor):
     def translate_plan(self, plan: StrategicPlan, 
                       context: ExecutionContext) -> List[ConcreteAction]:
         """Translate plan to actions."""
+        # Trusted internal data: model_construct skips re-validation, and the
+        # local alias avoids a global + attribute lookup per element
+        make_action = ConcreteAction.model_construct
         return [
-            ConcreteAction(
-                action_id=f"action_{i}",
-                action_type="api_call",
-                parameters={},
-                dependencies=[]
-            )
-            for i, action_name in enumerate(plan.action_sequence)
+            make_action(action_id=f"action_{i}", action_type="api_call",
+                        parameters={}, dependencies=[])
+            for i in range(len(plan.action_sequence))
         ]
     
     def execute_action(self, action: ConcreteAction, 
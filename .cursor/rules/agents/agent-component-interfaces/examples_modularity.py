@@ -5,43 +5,57 @@ This file demonstrates implementation swapping patterns, dependency injection, a
 Reference this example from RULE.mdc using @examples_modularity.py syntax.
 """
 
+import functools
 import json
 import logging
+import random
 import time
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 from abc import ABC, abstractmethod
 from enum import Enum
 
+import numpy as np
+from scipy.stats import ttest_ind
+
 # See @examples_performance_timing in monitoring-and-observability for full implementation.
 logger = logging.getLogger(__name__)
 
 
 class PerformanceTimer:
-    """Minimal PerformanceTimer for structured latency logging (start/end/duration_ms)."""
+    """Minimal PerformanceTimer for structured latency logging (start/end/duration_ms).
+
+    Timestamps are captured as epoch floats and only formatted (and the log line
+    only serialized) when INFO logging is enabled, so a filtered timer costs two
+    clock reads.
+    """
 
     def __init__(self, operation_name: str, **extra: Any) -> None:
         self.operation_name = operation_name
         self.extra = extra
         self.duration_seconds: float = 0.0
         self._start: float = 0.0
-        self._start_ts: str = ""
+        self._start_epoch: float = 0.0
 
     def __enter__(self) -> "PerformanceTimer":
         self._start = time.perf_counter()
-        self._start_ts = datetime.now(timezone.utc).isoformat()
+        self._start_epoch = time.time()
         return self
 
     def __exit__(self, *args: Any) -> None:
-        end_ts = datetime.now(timezone.utc).isoformat()
         self.duration_seconds = time.perf_counter() - self._start
-        duration_ms = self.duration_seconds * 1000
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        start_ts = datetime.fromtimestamp(self._start_epoch, timezone.utc).isoformat()
+        end_ts = datetime.fromtimestamp(
+            self._start_epoch + self.duration_seconds, timezone.utc
+        ).isoformat()
         log_data = {
             "timestamp": end_ts,
             "operation_name": self.operation_name,
-            "start_timestamp": self._start_ts,
+            "start_timestamp": start_ts,
             "end_timestamp": end_ts,
-            "duration_ms": round(duration_ms, 2),
+            "duration_ms": round(self.duration_seconds * 1000, 2),
             **self.extra,
         }
         logger.info("operation_completed %s", json.dumps(log_data))
@@ -152,6 +166,21 @@ class ExecutorType(str, Enum):
     PARALLEL = "parallel"
 
 
+# Implementation tables, built once at import instead of per factory call
+_PLANNERS: Dict[PlannerType, type] = {
+    PlannerType.BASIC: BasicPlanner,
+    PlannerType.ADVANCED: AdvancedPlanner,
+}
+_MEMORY_NODES: Dict[MemoryType, type] = {
+    MemoryType.LOCAL: LocalMemoryNode,
+    MemoryType.CLOUD: CloudMemoryNode,
+}
+_EXECUTORS: Dict[ExecutorType, type] = {
+    ExecutorType.SEQUENTIAL: SequentialExecutor,
+    ExecutorType.PARALLEL: ParallelExecutor,
+}
+
+
 class ComponentFactory:
     """
     Factory for creating component implementations.
@@ -160,6 +189,9 @@ class ComponentFactory:
     - Factory pattern for implementation selection
     - Dependency injection setup
     - Configuration-based selection
+    - Caching stateless implementations (one shared instance per type; the
+      default is resolved before the cache, so create_planner() and
+      create_planner(PlannerType.BASIC) return the same instance)
     """
     
     @staticmethod
@@ -171,13 +203,15 @@ class ComponentFactory:
             planner_type: Type of planner to create
             
         Returns:
-            Planner implementation
+            Shared Planner implementation (cached per type)
         """
-        planners = {
-            PlannerType.BASIC: BasicPlanner,
-            PlannerType.ADVANCED: AdvancedPlanner
-        }
-        planner_class = planners.get(planner_type, BasicPlanner)
+        return ComponentFactory._shared_planner(planner_type)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _shared_planner(planner_type: PlannerType) -> IPlanner:
+        """One Planner instance per type (see create_planner)."""
+        planner_class = _PLANNERS.get(planner_type, BasicPlanner)
         return planner_class()
     
     @staticmethod
@@ -189,13 +223,15 @@ class ComponentFactory:
             memory_type: Type of memory to create
             
         Returns:
-            Memory Node implementation
+            Shared Memory Node implementation (cached per type)
         """
-        memories = {
-            MemoryType.LOCAL: LocalMemoryNode,
-            MemoryType.CLOUD: CloudMemoryNode
-        }
-        memory_class = memories.get(memory_type, LocalMemoryNode)
+        return ComponentFactory._shared_memory_node(memory_type)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _shared_memory_node(memory_type: MemoryType) -> IMemoryNode:
+        """One Memory Node instance per type (see create_memory_node)."""
+        memory_class = _MEMORY_NODES.get(memory_type, LocalMemoryNode)
         return memory_class()
     
     @staticmethod
@@ -207,13 +243,15 @@ class ComponentFactory:
             executor_type: Type of executor to create
             
         Returns:
-            Executor implementation
+            Shared Executor implementation (cached per type)
         """
-        executors = {
-            ExecutorType.SEQUENTIAL: SequentialExecutor,
-            ExecutorType.PARALLEL: ParallelExecutor
-        }
-        executor_class = executors.get(executor_type, SequentialExecutor)
+        return ComponentFactory._shared_executor(executor_type)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _shared_executor(executor_type: ExecutorType) -> IExecutor:
+        """One Executor instance per type (see create_executor)."""
+        executor_class = _EXECUTORS.get(executor_type, SequentialExecutor)
         return executor_class()
 
 
@@ -231,9 +269,12 @@ class DIContainer:
     - Component resolution
     """
     
+    # Containers may be created per request scope; slots avoid a per-instance __dict__
+    __slots__ = ("_components",)
+    
     def __init__(self):
         """Initialize container."""
-        self._components: Dict[str, Any] = {}
+        self._components: Dict[type, Any] = {}
     
     def register(self, interface: type, implementation: Any):
         """
@@ -243,8 +284,7 @@ class DIContainer:
             interface: Interface type
             implementation: Implementation instance
         """
-        interface_name = interface.__name__
-        self._components[interface_name] = implementation
+        self._components[interface] = implementation
     
     def resolve(self, interface: type) -> Any:
         """
@@ -259,10 +299,10 @@ class DIContainer:
         Raises:
             ValueError: If component not registered
         """
-        interface_name = interface.__name__
-        if interface_name not in self._components:
-            raise ValueError(f"Component {interface_name} not registered")
-        return self._components[interface_name]
+        try:
+            return self._components[interface]
+        except KeyError:
+            raise ValueError(f"Component {interface.__name__} not registered") from None
 
 
 # ============================================================================
@@ -284,47 +324,124 @@ class ABTestingService:
         self.results: Dict[str, list] = {}
     
     def test_planners(self, user_request: Any, context: Any, 
-                     iterations: int = 10) -> Dict[str, Any]:
+                     iterations: int = 10, inner_batch: int = 100,
+                     warmup: int = 3, alpha: float = 0.05,
+                     min_rel_diff: float = 0.02,
+                     store_plans: bool = False) -> Dict[str, Any]:
         """
         A/B test different Planner implementations.
         
         Args:
             user_request: User request to test
             context: Planning context
-            iterations: Number of test iterations
+            iterations: Number of test iterations (timing samples per planner)
+            inner_batch: plan() calls per sample; the sample is their mean,
+                which amortizes timer overhead for microsecond-scale planners
+            warmup: Untimed plan() calls per planner before measuring, so
+                one-time costs (imports, caches, JIT) do not skew sample 0
+            alpha: Significance level for the Welch t-test
+            min_rel_diff: Relative difference in avg_time below which the
+                planners are treated as equivalent (noise floor)
+            store_plans: Keep the last plan of every sample under "plans";
+                off by default so long runs hold only the timing arrays
             
         Returns:
-            Test results comparison
+            Test results comparison; "recommendation" is "tie" unless the
+            faster planner is both statistically and practically faster
+            
+        Raises:
+            ValueError: If iterations or inner_batch is less than 1
         """
+        if iterations < 1:
+            raise ValueError(f"iterations must be at least 1, got {iterations}")
+        if inner_batch < 1:
+            raise ValueError(f"inner_batch must be at least 1, got {inner_batch}")
+        
         basic_planner = BasicPlanner()
         advanced_planner = AdvancedPlanner()
         
-        basic_results = []
-        advanced_results = []
+        # Timings go into preallocated float64 arrays (needed whole for the
+        # t-test and percentiles); plans are only retained on request
+        basic_times = np.empty(iterations)
+        advanced_times = np.empty(iterations)
+        basic_plans: Optional[list] = [] if store_plans else None
+        advanced_plans: Optional[list] = [] if store_plans else None
+        arms = [
+            (basic_planner, basic_times, basic_plans),
+            (advanced_planner, advanced_times, advanced_plans),
+        ]
+        
+        for _ in range(warmup):
+            basic_planner.plan(user_request, context)
+            advanced_planner.plan(user_request, context)
+        
+        # Single outer timer: its overhead is not charged to individual plan() calls
+        with PerformanceTimer("ab_test_planners", iterations=iterations):
+            for i in range(iterations):
+                # Interleave arms in random order so drift (turbo, GC, noisy
+                # neighbours) does not systematically favour one implementation
+                random.shuffle(arms)
+                for planner, times, plans in arms:
+                    t0 = time.perf_counter_ns()
+                    for _ in range(inner_batch):
+                        plan = planner.plan(user_request, context)
+                    elapsed_ns = time.perf_counter_ns() - t0
+                    times[i] = elapsed_ns * 1e-9 / inner_batch
+                    # Keep only the last plan of the batch, not inner_batch copies
+                    if plans is not None:
+                        plans.append(plan)
         
-        for i in range(iterations):
-            with PerformanceTimer("ab_test_basic_planner", iteration=i) as t_basic:
-                basic_plan = basic_planner.plan(user_request, context)
-            basic_results.append({"time": t_basic.duration_seconds, "plan": basic_plan})
-
-            with PerformanceTimer("ab_test_advanced_planner", iteration=i) as t_adv:
-                advanced_plan = advanced_planner.plan(user_request, context)
-            advanced_results.append({"time": t_adv.duration_seconds, "plan": advanced_plan})
+        basic_stats = self._summarize(basic_times)
+        advanced_stats = self._summarize(advanced_times)
         
-        # Calculate statistics
-        basic_avg_time = sum(r["time"] for r in basic_results) / len(basic_results)
-        advanced_avg_time = sum(r["time"] for r in advanced_results) / len(advanced_results)
+        # Welch's t-test (unequal variances): only declare a winner when the
+        # difference is significant AND above the noise floor, so the
+        # recommendation does not flip between runs on noise alone
+        basic_avg = basic_stats["avg_time"]
+        advanced_avg = advanced_stats["avg_time"]
+        _, p_value = ttest_ind(basic_times, advanced_times, equal_var=False)
+        p_value = float(p_value)
+        fastest = min(basic_avg, advanced_avg)
+        rel_diff = abs(basic_avg - advanced_avg) / fastest if fastest > 0 else 0.0
+        
+        recommendation = "tie"
+        if p_value < alpha and rel_diff > min_rel_diff:  # NaN p-value -> tie
+            recommendation = "basic" if basic_avg < advanced_avg else "advanced"
+        
+        if store_plans:
+            basic_stats["plans"] = basic_plans
+            advanced_stats["plans"] = advanced_plans
+        
+        return {
+            "basic": basic_stats,
+            "advanced": advanced_stats,
+            "p_value": p_value,
+            "rel_diff": rel_diff,
+            "recommendation": recommendation
+        }
+    
+    @staticmethod
+    def _summarize(times: np.ndarray, trim: float = 0.1) -> Dict[str, float]:
+        """
+        Summarize timing samples.
         
+        Args:
+            times: Per-call timing samples in seconds
+            trim: Fraction of samples dropped from each end for avg_time
+            
+        Returns:
+            avg_time (trimmed mean), p50, p95 and stddev in seconds, and
+            the sample count n
+        """
+        ordered = np.sort(times)
+        k = int(len(ordered) * trim)
+        kept = ordered[k:len(ordered) - k] if len(ordered) > 2 * k else ordered
         return {
-            "basic": {
-                "avg_time": basic_avg_time,
-                "results": basic_results
-            },
-            "advanced": {
-                "avg_time": advanced_avg_time,
-                "results": advanced_results
-            },
-            "recommendation": "basic" if basic_avg_time < advanced_avg_time else "advanced"
+            "avg_time": float(kept.mean()),
+            "p50": float(np.median(ordered)),
+            "p95": float(np.quantile(ordered, 0.95)),
+            "stddev": float(ordered.std(ddof=1)) if len(ordered) > 1 else 0.0,
+            "n": len(ordered),
         }
     
     def swap_implementation(self, interface: type, new_implementation: Any, 
@@ -386,9 +503,9 @@ def example_ab_testing():
         iterations=10
     )
     
-    # Use recommended implementation
+    # Use recommended implementation (keep the basic one on a tie)
     recommended = results["recommendation"]
-    if recommended == "basic":
+    if recommended in ("basic", "tie"):
         planner = BasicPlanner()
     else:
         planner = AdvancedPlanner()
@@ -5,11 +5,17 @@ This file demonstrates summarization implementations and trimming logic.
 Reference this example from RULE.mdc using @examples_compression.py syntax.
 """
 
-from typing import List, Dict, Any, Optional, TypedDict
-from dataclasses import dataclass
-from enum import Enum
+import functools
+import io
+import sys
+from collections.abc import Sequence
+from typing import List, Dict, Any, Optional, Tuple, TypedDict, Union
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
 from datetime import datetime
 
+import numpy as np
+
 
 # ============================================================================
 # Compression Types
@@ -29,7 +35,29 @@ class CompressionType(Enum):
     HIERARCHICAL = "hierarchical"
 
 
-@dataclass
+class Role(IntEnum):
+    """
+    Compact message role codes.
+    
+    SYSTEM and USER are the lowest codes, so "always keep" roles can be
+    tested with a single comparison (role_code <= Role.USER).
+    """
+    SYSTEM = 0
+    USER = 1
+    ASSISTANT = 2
+    TOOL = 3
+    OTHER = 4
+
+
+_ROLE_CODES: Dict[str, Role] = {
+    "system": Role.SYSTEM,
+    "user": Role.USER,
+    "assistant": Role.ASSISTANT,
+    "tool": Role.TOOL,
+}
+
+
+@dataclass(slots=True)
 class Message:
     """
     Conversation message structure.
@@ -38,13 +66,21 @@ class Message:
     - Role (user/assistant/system)
     - Content
     - Metadata (timestamp, tokens, importance)
+    - Slotted storage and interned roles for large histories
+    - Integer role code, derived from role at construction
     """
     role: str  # "user", "assistant", "system", "tool"
     content: str
     timestamp: datetime
     token_count: int = 0
     importance_score: float = 0.5
-    metadata: Dict[str, Any] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    role_code: Role = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Intern the role and derive its code (roles are not reassigned later)."""
+        self.role = sys.intern(self.role)
+        self.role_code = _ROLE_CODES.get(self.role, Role.OTHER)
 
 
 @dataclass
@@ -77,6 +113,7 @@ class TokenCounter:
     - Model-specific tokenizers
     - Accurate token estimation
     - Batch counting
+    - Memoized counts for repeated content
     """
     
     def __init__(self, model_name: str = "gpt-4"):
@@ -89,6 +126,10 @@ class TokenCounter:
         self.model_name = model_name
         # In real implementation, load appropriate tokenizer
         # e.g., tiktoken for OpenAI models
+        
+        # Per-instance cache, so the key is effectively (model_name, text);
+        # the same message text is re-counted on every compression pass
+        self._count_cached = functools.lru_cache(maxsize=4096)(self._count_uncached)
     
     def count_tokens(self, text: str) -> int:
         """
@@ -100,6 +141,10 @@ class TokenCounter:
         Returns:
             Number of tokens
         """
+        return self._count_cached(text)
+    
+    def _count_uncached(self, text: str) -> int:
+        """Run the tokenizer (uncached)."""
         # In real implementation:
         # if "gpt" in self.model_name.lower():
         #     import tiktoken
@@ -111,19 +156,76 @@ class TokenCounter:
         # Rough estimate: 1 token ≈ 4 characters
         return len(text) // 4
     
-    def count_messages(self, messages: List[Message]) -> int:
+    def count_messages(self, messages: Union[List[Message], "MessageBuffer"]) -> int:
         """
         Count total tokens in messages.
         
         Args:
-            messages: List of messages
+            messages: List of messages, or a MessageBuffer (summed in one NumPy call)
             
         Returns:
             Total token count
         """
+        if isinstance(messages, MessageBuffer):
+            return messages.total_tokens()
         return sum(msg.token_count for msg in messages)
 
 
+class MessageBuffer(Sequence):
+    """
+    Append-only conversation history with a companion token-count column.
+    
+    This demonstrates incremental token bookkeeping:
+    - Token counts captured once, when a message is appended
+    - Contiguous int32 column (geometric growth) summed in a single C call
+    - Behaves as a read-only sequence of Message for existing code
+    """
+    
+    def __init__(self, token_counter: Optional[TokenCounter] = None, capacity: int = 64):
+        """
+        Initialize message buffer.
+        
+        Args:
+            token_counter: Used to fill token_count for messages appended with 0
+                (defaults to a TokenCounter, so the column never records an
+                uncounted message)
+            capacity: Initial token column capacity
+        """
+        self.token_counter = token_counter or TokenCounter()
+        self._messages: List[Message] = []
+        self._tokens = np.zeros(max(1, capacity), dtype=np.int32)
+    
+    def append(self, message: Message) -> None:
+        """
+        Append a message and record its token count.
+        
+        Args:
+            message: Message to append
+        """
+        if message.token_count == 0:
+            message.token_count = self.token_counter.count_tokens(message.content)
+        n = len(self._messages)
+        if n == len(self._tokens):
+            self._tokens = np.resize(self._tokens, 2 * n)
+        self._tokens[n] = message.token_count
+        self._messages.append(message)
+    
+    def extend(self, messages: List[Message]) -> None:
+        """Append several messages."""
+        for message in messages:
+            self.append(message)
+    
+    def total_tokens(self) -> int:
+        """Total tokens across all messages."""
+        return int(self._tokens[:len(self._messages)].sum())
+    
+    def __getitem__(self, index):
+        return self._messages[index]
+    
+    def __len__(self) -> int:
+        return len(self._messages)
+
+
 # ============================================================================
 # Compression Triggers
 # ============================================================================
@@ -158,6 +260,9 @@ class CompressionTrigger:
         self.warning_threshold = warning_threshold
         self.compression_threshold = compression_threshold
         self.critical_threshold = critical_threshold
+        # (buffer, length, total) from the last check; an append-only buffer
+        # whose length is unchanged has the same token total
+        self._last_count: Optional[tuple] = None
     
     def check_compression_needed(
         self,
@@ -174,7 +279,7 @@ class CompressionTrigger:
         Returns:
             Dictionary with compression status
         """
-        total_tokens = self.token_counter.count_messages(messages)
+        total_tokens = self._count(messages)
         usage_ratio = total_tokens / model_context_limit if model_context_limit > 0 else 0
         
         status = {
@@ -195,6 +300,39 @@ class CompressionTrigger:
             status["compression_urgency"] = "warning"
         
         return status
+    
+    def _count(self, messages: Union[List[Message], MessageBuffer]) -> int:
+        """Count tokens, reusing the last total for an unchanged MessageBuffer."""
+        if isinstance(messages, MessageBuffer):
+            last = self._last_count
+            if last is not None and last[0] is messages and last[1] == len(messages):
+                return last[2]
+            total = self.token_counter.count_messages(messages)
+            self._last_count = (messages, len(messages), total)
+            return total
+        return self.token_counter.count_messages(messages)
+
+
+# ============================================================================
+# Message Splitting
+# ============================================================================
+
+def split_recent(
+    messages: List[Message],
+    preserve_recent: int
+) -> Tuple[List[Message], List[Message]]:
+    """
+    Split messages into (old, recent) with a single split index.
+    
+    Args:
+        messages: List of messages
+        preserve_recent: Number of most recent messages to preserve
+        
+    Returns:
+        Tuple of (old messages, recent messages)
+    """
+    k = max(0, len(messages) - preserve_recent)
+    return messages[:k], messages[k:]
 
 
 # ============================================================================
@@ -211,6 +349,12 @@ class ExtractiveSummarizer:
     - Fast, no LLM call needed
     """
     
+    def __init__(self):
+        """Initialize extractive summarizer."""
+        # Sentence extraction is cached per distinct text, so later
+        # compression passes over the same history skip the string scans
+        self._key_sentences = functools.lru_cache(maxsize=4096)(self._extract_key_sentences)
+    
     def summarize(
         self,
         messages: List[Message],
@@ -229,19 +373,37 @@ class ExtractiveSummarizer:
             Compressed list of messages
         """
         # Preserve recent messages
-        recent_messages = messages[-preserve_recent:] if len(messages) > preserve_recent else messages
-        old_messages = messages[:-preserve_recent] if len(messages) > preserve_recent else []
+        old_messages, recent_messages = split_recent(messages, preserve_recent)
         
         if not old_messages:
             return messages
         
+        return self.summarize_split(old_messages, recent_messages, target_tokens)
+    
+    def summarize_split(
+        self,
+        old_messages: List[Message],
+        recent_messages: List[Message],
+        target_tokens: int
+    ) -> List[Message]:
+        """
+        Summarize already split messages (see split_recent).
+        
+        Args:
+            old_messages: Messages eligible for compression
+            recent_messages: Recent messages kept verbatim
+            target_tokens: Target token count
+            
+        Returns:
+            Compressed list of messages
+        """
         # Extract important sentences from old messages
         compressed_old = []
         current_tokens = sum(msg.token_count for msg in recent_messages)
         
         for message in reversed(old_messages):
             # Extract key sentences (simplified - in real implementation, use NLP)
-            key_sentences = self._extract_key_sentences(message.content)
+            key_sentences = self._key_sentences(message.content)
             
             # Create compressed message
             compressed_content = " ".join(key_sentences)
@@ -254,16 +416,19 @@ class ExtractiveSummarizer:
                     timestamp=message.timestamp,
                     token_count=compressed_tokens,
                     importance_score=message.importance_score,
-                    metadata={**message.metadata or {}, "compressed": True, "original_tokens": message.token_count}
+                    metadata={**message.metadata, "compressed": True, "original_tokens": message.token_count}
                 )
-                compressed_old.insert(0, compressed_message)
+                compressed_old.append(compressed_message)
                 current_tokens += compressed_tokens
             else:
                 break
         
+        # Built newest-first; one O(N) reverse instead of O(N) insert(0, ...) per message
+        compressed_old.reverse()
         return compressed_old + recent_messages
     
-    def _extract_key_sentences(self, text: str) -> List[str]:
+    @staticmethod
+    def _extract_key_sentences(text: str) -> Tuple[str, ...]:
         """
         Extract key sentences from text.
         
@@ -271,7 +436,7 @@ class ExtractiveSummarizer:
             text: Text to extract from
             
         Returns:
-            List of key sentences
+            Key sentences (a tuple, since results are cached and shared)
         """
         # In real implementation, use NLP techniques:
         # - Sentence tokenization
@@ -281,9 +446,9 @@ class ExtractiveSummarizer:
         # Simple implementation: split by sentences and take first/last
         sentences = text.split(". ")
         if len(sentences) <= 3:
-            return sentences
+            return tuple(sentences)
         # Take first, middle, and last sentences
-        return [sentences[0], sentences[len(sentences)//2], sentences[-1]]
+        return (sentences[0], sentences[len(sentences)//2], sentences[-1])
 
 
 # ============================================================================
@@ -327,14 +492,32 @@ class AbstractiveSummarizer:
             Compressed list of messages
         """
         # Preserve recent messages
-        recent_messages = messages[-preserve_recent:] if len(messages) > preserve_recent else messages
-        old_messages = messages[:-preserve_recent] if len(messages) > preserve_recent else []
+        old_messages, recent_messages = split_recent(messages, preserve_recent)
         
         if not old_messages:
             return messages
         
+        return self.summarize_split(old_messages, recent_messages, target_tokens)
+    
+    def summarize_split(
+        self,
+        old_messages: List[Message],
+        recent_messages: List[Message],
+        target_tokens: int
+    ) -> List[Message]:
+        """
+        Summarize already split messages (see split_recent).
+        
+        Args:
+            old_messages: Messages to replace with a summary (non-empty)
+            recent_messages: Recent messages kept verbatim
+            target_tokens: Target token count
+            
+        Returns:
+            Compressed list of messages
+        """
         # Generate summary of old messages
-        old_content = "\n".join([f"{msg.role}: {msg.content}" for msg in old_messages])
+        old_content = self._format_history(old_messages)
         
         # In real implementation, use LLM to generate summary:
         # summary = self.llm_client.generate(
@@ -356,6 +539,32 @@ class AbstractiveSummarizer:
         )
         
         return [summary_message] + recent_messages
+    
+    @staticmethod
+    def _format_history(messages: List[Message]) -> str:
+        """
+        Render messages as "role: content" lines for the summarization prompt.
+        
+        Writes pieces straight into one buffer instead of creating a formatted
+        string per message (str.join materializes a generator into a list
+        anyway, so a generator alone would not reduce peak memory).
+        
+        Args:
+            messages: Messages to render
+            
+        Returns:
+            Newline-separated conversation history
+        """
+        buf = io.StringIO()
+        write = buf.write
+        separator = ""
+        for msg in messages:
+            write(separator)
+            write(msg.role)
+            write(": ")
+            write(msg.content)
+            separator = "\n"
+        return buf.getvalue()
 
 
 # ============================================================================
@@ -375,7 +584,8 @@ class ContextCompressionService:
     def __init__(
         self,
         token_counter: TokenCounter,
-        compression_type: CompressionType = CompressionType.ABSTRACTIVE
+        compression_type: CompressionType = CompressionType.ABSTRACTIVE,
+        trigger: Optional[CompressionTrigger] = None
     ):
         """
         Initialize compression service.
@@ -383,9 +593,12 @@ class ContextCompressionService:
         Args:
             token_counter: Token counter instance
             compression_type: Default compression type
+            trigger: Compression trigger (defaults to one using token_counter)
         """
         self.token_counter = token_counter
         self.compression_type = compression_type
+        # Reused across calls so the trigger's token-total cache carries over
+        self.trigger = trigger or CompressionTrigger(token_counter)
         self.extractive_summarizer = ExtractiveSummarizer()
         self.abstractive_summarizer = AbstractiveSummarizer()
     
@@ -406,9 +619,15 @@ class ContextCompressionService:
         Returns:
             Compressed list of messages
         """
+        # Tokenize each message once; count_messages is then a pure sum.
+        # A MessageBuffer counts its messages on append, so it is left as is.
+        if not isinstance(messages, MessageBuffer):
+            for msg in messages:
+                if msg.token_count == 0:
+                    msg.token_count = self.token_counter.count_tokens(msg.content)
+        
         # Check if compression needed
-        trigger = CompressionTrigger(self.token_counter)
-        status = trigger.check_compression_needed(messages, model_context_limit)
+        status = self.trigger.check_compression_needed(messages, model_context_limit)
         
         if not status["needs_compression"]:
             return messages
@@ -421,22 +640,20 @@ class ContextCompressionService:
         # Choose compression type
         compression_type = config.compression_type if config else self.compression_type
         
+        # Split once; every strategy works on the same old/recent lists
+        preserve_recent = config.preserve_recent_messages if config else 5
+        old, recent = split_recent(messages, preserve_recent)
+        
         # Apply compression
-        if compression_type == CompressionType.EXTRACTIVE:
-            compressed = self.extractive_summarizer.summarize(
-                messages,
-                target_tokens,
-                preserve_recent=config.preserve_recent_messages if config else 5
-            )
+        if not old:
+            compressed = messages
+        elif compression_type == CompressionType.EXTRACTIVE:
+            compressed = self.extractive_summarizer.summarize_split(old, recent, target_tokens)
         elif compression_type == CompressionType.ABSTRACTIVE:
-            compressed = self.abstractive_summarizer.summarize(
-                messages,
-                target_tokens,
-                preserve_recent=config.preserve_recent_messages if config else 5
-            )
+            compressed = self.abstractive_summarizer.summarize_split(old, recent, target_tokens)
         else:
             # Hierarchical - combine both methods
-            compressed = self._hierarchical_compress(messages, target_tokens, config)
+            compressed = self._hierarchical_compress(old, recent, target_tokens)
         
         # Validate compression
         final_tokens = self.token_counter.count_messages(compressed)
@@ -448,9 +665,9 @@ class ContextCompressionService:
     
     def _hierarchical_compress(
         self,
-        messages: List[Message],
-        target_tokens: int,
-        config: Optional[CompressionConfig]
+        old: List[Message],
+        recent: List[Message],
+        target_tokens: int
     ) -> List[Message]:
         """Apply hierarchical compression (combines extractive and abstractive)."""
         # In real implementation:
@@ -458,17 +675,8 @@ class ContextCompressionService:
         # 2. Use extractive for moderately old messages
         # 3. Keep recent messages intact
         
-        preserve_recent = config.preserve_recent_messages if config else 5
-        recent = messages[-preserve_recent:]
-        old = messages[:-preserve_recent] if len(messages) > preserve_recent else []
-        
-        if not old:
-            return messages
-        
         # Abstractive summary for old messages
-        compressed_old = self.abstractive_summarizer.summarize(old, target_tokens // 2, preserve_recent=0)
-        
-        return compressed_old + recent
+        return self.abstractive_summarizer.summarize_split(old, recent, target_tokens // 2)
     
     def _aggressive_compress(
         self,
@@ -482,9 +690,11 @@ class ContextCompressionService:
         
         for message in reversed(messages):
             if current_tokens + message.token_count <= model_context_limit * 0.8:
-                compressed.insert(0, message)
+                compressed.append(message)
                 current_tokens += message.token_count
             else:
                 break
         
+        # Built newest-first; restore chronological order in one pass
+        compressed.reverse()
         return compressed
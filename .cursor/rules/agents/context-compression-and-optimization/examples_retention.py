@@ -5,12 +5,91 @@ This file demonstrates retention criteria and importance scoring patterns.
 Reference this example from RULE.mdc using @examples_retention.py syntax.
 """
 
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+import bisect
+import functools
+import heapq
+import re
+from collections import deque
+from typing import Deque, List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta
 
-from examples_compression import Message
+import numpy as np
+
+from examples_compression import Message, Role
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; fall back to NumPy set ops
+    njit = None
+
+
+# ============================================================================
+# Keyword Overlap Kernel
+# ============================================================================
+
+def _sorted_overlap_py(a: np.ndarray, b: np.ndarray) -> int:
+    """Count common values of two sorted, unique int64 arrays (NumPy fallback)."""
+    return np.intersect1d(a, b, assume_unique=True).size
+
+
+if njit is not None:
+    @njit(cache=True, nogil=True)
+    def _sorted_overlap(a, b):
+        """Count common values of two sorted, unique int64 arrays (merge walk)."""
+        i = j = count = 0
+        while i < a.shape[0] and j < b.shape[0]:
+            if a[i] == b[j]:
+                count += 1
+                i += 1
+                j += 1
+            elif a[i] < b[j]:
+                i += 1
+            else:
+                j += 1
+        return count
+else:
+    _sorted_overlap = _sorted_overlap_py
+
+
+def _keyword_hashes(text: str) -> np.ndarray:
+    """Sorted, unique int64 hashes of the lower-cased whitespace tokens of text."""
+    return np.unique(np.fromiter((hash(t) for t in text.lower().split()), dtype=np.int64))
+
+
+# ============================================================================
+# Column Scoring Kernel
+# ============================================================================
+
+def _score_columns_py(types, ts_ns, now_ns, relevance, type_scores, edges, values):
+    """Final scores from message columns (NumPy fallback, see _score_columns)."""
+    ages = (now_ns - ts_ns) / 1e9
+    recency = values[edges.searchsorted(ages, side="right")]
+    return type_scores[types] * recency * (0.7 + 0.3 * relevance)
+
+
+if njit is not None:
+    # No fastmath: the scores must round exactly like ImportanceScore.final_score
+    @njit(cache=True, parallel=True)
+    def _score_columns(types, ts_ns, now_ns, relevance, type_scores, edges, values):
+        """
+        Final scores from message columns in one fused pass.
+        
+        Base score lookup, recency bucketing and the relevance blend are done
+        per element, so no intermediate arrays are allocated.
+        """
+        n = types.shape[0]
+        out = np.empty(n, dtype=np.float64)
+        for i in prange(n):
+            age = (now_ns - ts_ns[i]) / 1e9
+            bucket = 0
+            while bucket < edges.shape[0] and age >= edges[bucket]:
+                bucket += 1
+            out[i] = type_scores[types[i]] * values[bucket] * (0.7 + 0.3 * relevance[i])
+        return out
+else:
+    _score_columns = _score_columns_py
 
 
 # ============================================================================
@@ -34,7 +113,85 @@ class MessageType(Enum):
     PREFERENCE = "preference"
 
 
-@dataclass
+# Content keyword tiers, checked in priority order. Case-insensitive search
+# avoids building a lower-cased copy of the whole message per call.
+_PREFERENCE_RE = re.compile(r"preference|i prefer|i like", re.IGNORECASE)
+_ERROR_RE = re.compile(r"error|failed", re.IGNORECASE)
+_CRITICAL_RE = re.compile(r"error|critical", re.IGNORECASE)
+
+# Roles that determine the message type regardless of content
+_ROLE_TYPES: Dict[str, MessageType] = {
+    "user": MessageType.USER_REQUEST,
+    "system": MessageType.SYSTEM_INSTRUCTION,
+}
+
+# Compact uint8 code per message type, used by MessageColumns
+_TYPE_INDEX: Dict[MessageType, int] = {t: i for i, t in enumerate(MessageType)}
+
+# Recency buckets: ages below _RECENCY_EDGES[i] (seconds) get _RECENCY_VALUES[i];
+# the last value applies past the final edge (5 min, 30 min, 1 h, 2 h)
+_RECENCY_EDGES = (300, 1800, 3600, 7200)
+_RECENCY_VALUES = (1.0, 0.9, 0.7, 0.5, 0.3)
+_RECENCY_EDGES_NP = np.array(_RECENCY_EDGES, dtype=np.float64)
+_RECENCY_VALUES_NP = np.array(_RECENCY_VALUES, dtype=np.float64)
+
+
+def _epoch_ns(moment: datetime) -> int:
+    """Timestamp in whole microseconds, as ns, so ages match timedelta arithmetic."""
+    return round(moment.timestamp() * 1e6) * 1000
+
+
+class MessageColumns:
+    """
+    Structure-of-arrays view of a conversation for vectorized scoring.
+    
+    This demonstrates columnar message storage:
+    - One contiguous NumPy column per scored field
+    - Message type classified once, when a message is appended
+    - Geometric growth, so appends are amortized O(1)
+    """
+    
+    __slots__ = ("messages", "types", "ts_ns", "tokens", "importance")
+    
+    def __init__(self, capacity: int = 64):
+        """
+        Initialize message columns.
+        
+        Args:
+            capacity: Initial column capacity
+        """
+        capacity = max(1, capacity)
+        self.messages: List[Message] = []
+        self.types = np.zeros(capacity, dtype=np.uint8)
+        self.ts_ns = np.zeros(capacity, dtype=np.int64)
+        self.tokens = np.zeros(capacity, dtype=np.int32)
+        self.importance = np.zeros(capacity, dtype=np.float32)
+    
+    def append(self, message: Message, msg_type: MessageType) -> None:
+        """
+        Append a message with its classified type.
+        
+        Args:
+            message: Message to append
+            msg_type: Message type (see ImportanceScorer._classify_message)
+        """
+        n = len(self.messages)
+        if n == len(self.types):
+            self.types = np.resize(self.types, 2 * n)
+            self.ts_ns = np.resize(self.ts_ns, 2 * n)
+            self.tokens = np.resize(self.tokens, 2 * n)
+            self.importance = np.resize(self.importance, 2 * n)
+        self.types[n] = _TYPE_INDEX[msg_type]
+        self.ts_ns[n] = _epoch_ns(message.timestamp)
+        self.tokens[n] = message.token_count
+        self.importance[n] = message.importance_score
+        self.messages.append(message)
+    
+    def __len__(self) -> int:
+        return len(self.messages)
+
+
+@dataclass(slots=True)
 class ImportanceScore:
     """
     Importance score for a message.
@@ -48,11 +205,11 @@ class ImportanceScore:
     base_score: float  # 0.0-1.0 based on message type
     recency_multiplier: float  # 0.0-1.0 based on age
     relevance_score: float  # 0.0-1.0 based on relevance to current task
-    final_score: float  # Combined score
     
-    def __post_init__(self):
-        """Calculate final score after initialization."""
-        self.final_score = self.base_score * self.recency_multiplier * (0.7 + 0.3 * self.relevance_score)
+    @property
+    def final_score(self) -> float:
+        """Combined score, derived from the three components on access."""
+        return self.base_score * self.recency_multiplier * (0.7 + 0.3 * self.relevance_score)
 
 
 class ImportanceScorer:
@@ -68,8 +225,18 @@ class ImportanceScorer:
     
     def __init__(self):
         """Initialize importance scorer."""
-        # Base scores by message type
-        self.type_scores = {
+        # Keyword hashes are cached per distinct text, so re-scoring the same
+        # history only tokenizes new messages
+        self._hashes = functools.lru_cache(maxsize=4096)(_keyword_hashes)
+        
+        # Base and relevance scores depend only on (role, content, task), so
+        # repeated sweeps over unchanged history reuse them; only recency,
+        # which depends on current_time, is recomputed
+        self._content_scores = functools.lru_cache(maxsize=4096)(self._score_content)
+        
+        # Base scores by message type, as a lookup table indexed by
+        # _TYPE_INDEX so whole type columns can be scored at once
+        base_scores = {
             MessageType.USER_REQUEST: 1.0,
             MessageType.SYSTEM_INSTRUCTION: 0.95,
             MessageType.PREFERENCE: 0.9,
@@ -77,6 +244,9 @@ class ImportanceScorer:
             MessageType.AGENT_RESPONSE: 0.6,
             MessageType.TOOL_RESULT: 0.5
         }
+        self.type_scores = np.full(len(_TYPE_INDEX), 0.5, dtype=np.float64)
+        for msg_type, value in base_scores.items():
+            self.type_scores[_TYPE_INDEX[msg_type]] = value
     
     def score_message(
         self,
@@ -95,45 +265,139 @@ class ImportanceScorer:
         Returns:
             ImportanceScore
         """
-        # Determine message type
-        msg_type = self._classify_message(message)
-        base_score = self.type_scores.get(msg_type, 0.5)
+        # Type-based and relevance scores (cached per role/content/task)
+        base_score, relevance_score = self._content_scores(
+            message.role, message.content, current_task
+        )
         
         # Calculate recency multiplier
         recency_multiplier = self._calculate_recency(message.timestamp, current_time)
         
-        # Calculate relevance score
-        relevance_score = self._calculate_relevance(message, current_task)
-        
         score = ImportanceScore(
             base_score=base_score,
             recency_multiplier=recency_multiplier,
-            relevance_score=relevance_score,
-            final_score=0.0  # Will be calculated in __post_init__
+            relevance_score=relevance_score
         )
         
         return score
     
-    def _classify_message(self, message: Message) -> MessageType:
+    def build_columns(self, messages: List[Message]) -> MessageColumns:
+        """
+        Build a columnar view of messages for score_all.
+        
+        Args:
+            messages: Messages in conversation order
+        
+        Returns:
+            MessageColumns with each message classified
+        """
+        cols = MessageColumns(capacity=len(messages))
+        for message in messages:
+            cols.append(message, self._classify_message(message.role, message.content))
+        return cols
+    
+    def score_all(
+        self,
+        cols: MessageColumns,
+        current_time: datetime,
+        current_task: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Score every message in cols in one pass over the columns.
+        
+        Final scores are also written back to cols.importance.
+        
+        Args:
+            cols: Columnar messages (see build_columns)
+            current_time: Current timestamp
+            current_task: Optional current task for relevance
+        
+        Returns:
+            float64 array of final scores, aligned with cols.messages (same
+            values as ImportanceScore.final_score, so thresholds agree)
+        """
+        n = len(cols)
+        
+        if current_task:
+            relevance = np.fromiter(
+                (self._calculate_relevance(m.content, current_task) for m in cols.messages),
+                dtype=np.float64,
+                count=n
+            )
+        else:
+            relevance = np.full(n, 0.7, dtype=np.float64)
+        
+        scores = _score_columns(
+            cols.types[:n],
+            cols.ts_ns[:n],
+            _epoch_ns(current_time),
+            relevance,
+            self.type_scores,
+            _RECENCY_EDGES_NP,
+            _RECENCY_VALUES_NP
+        )
+        cols.importance[:n] = scores
+        return scores
+    
+    def score_messages_batch(
+        self,
+        messages: List[Message],
+        current_time: datetime,
+        current_task: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Score a list of messages in bulk.
+        
+        Args:
+            messages: Messages to score
+            current_time: Current timestamp
+            current_task: Optional current task for relevance
+        
+        Returns:
+            float64 array of final scores, aligned with messages
+        """
+        return self.score_all(self.build_columns(messages), current_time, current_task)
+    
+    def _score_content(
+        self,
+        role: str,
+        content: str,
+        current_task: Optional[str]
+    ) -> Tuple[float, float]:
+        """
+        Compute the time-independent parts of a message score.
+        
+        Args:
+            role: Message role
+            content: Message content
+            current_task: Optional current task for relevance
+        
+        Returns:
+            Tuple of (base score, relevance score)
+        """
+        msg_type = self._classify_message(role, content)
+        base_score = float(self.type_scores[_TYPE_INDEX[msg_type]])
+        return base_score, self._calculate_relevance(content, current_task)
+    
+    def _classify_message(self, role: str, content: str) -> MessageType:
         """
         Classify message type.
         
         Args:
-            message: Message to classify
+            role: Message role
+            content: Message content
             
         Returns:
             MessageType
         """
-        role = message.role.lower()
-        content = message.content.lower()
+        # Roles are interned lowercase literals, so no per-call lower() is needed
+        role_type = _ROLE_TYPES.get(role)
+        if role_type is not None:
+            return role_type
         
-        if role == "user":
-            return MessageType.USER_REQUEST
-        elif role == "system":
-            return MessageType.SYSTEM_INSTRUCTION
-        elif "preference" in content or "i prefer" in content or "i like" in content:
+        if _PREFERENCE_RE.search(content):
             return MessageType.PREFERENCE
-        elif "error" in content or "failed" in content:
+        elif _ERROR_RE.search(content):
             return MessageType.ERROR
         elif role == "tool":
             return MessageType.TOOL_RESULT
@@ -153,25 +417,17 @@ class ImportanceScorer:
         """
         age_seconds = (current_time - message_time).total_seconds()
         
-        # Recent messages (last 10% of conversation) get full weight
-        # Older messages get progressively lower weight
-        if age_seconds < 300:  # Last 5 minutes
-            return 1.0
-        elif age_seconds < 1800:  # Last 30 minutes
-            return 0.9
-        elif age_seconds < 3600:  # Last hour
-            return 0.7
-        elif age_seconds < 7200:  # Last 2 hours
-            return 0.5
-        else:
-            return 0.3
+        # Recent messages get full weight, older ones progressively less.
+        # Same bucket table as score_all; bisect avoids NumPy call overhead
+        # for a single value.
+        return _RECENCY_VALUES[bisect.bisect_right(_RECENCY_EDGES, age_seconds)]
     
-    def _calculate_relevance(self, message: Message, current_task: Optional[str]) -> float:
+    def _calculate_relevance(self, content: str, current_task: Optional[str]) -> float:
         """
         Calculate relevance to current task.
         
         Args:
-            message: Message to evaluate
+            content: Message content to evaluate
             current_task: Current task description
             
         Returns:
@@ -181,14 +437,14 @@ class ImportanceScorer:
             return 0.7  # Default relevance
         
         # In real implementation, use semantic similarity or keyword matching
-        # For now, simple keyword matching
-        task_keywords = set(current_task.lower().split())
-        message_keywords = set(message.content.lower().split())
+        # For now, simple keyword matching on cached, sorted keyword hashes
+        task_hashes = self._hashes(current_task)
         
-        if not task_keywords:
+        if task_hashes.size == 0:
             return 0.7
         
-        overlap = len(task_keywords & message_keywords) / len(task_keywords)
+        message_hashes = self._hashes(content)
+        overlap = _sorted_overlap(task_hashes, message_hashes) / task_hashes.size
         return min(1.0, overlap * 2)  # Scale to 0.0-1.0
 
 
@@ -196,6 +452,18 @@ class ImportanceScorer:
 # Retention Criteria
 # ============================================================================
 
+def _is_mandatory_keep(message: Message) -> bool:
+    """Whether message must be kept regardless of its score."""
+    # System and user roles are always kept (they have the lowest role codes)
+    return (
+        message.role_code <= Role.USER
+        or _CRITICAL_RE.search(message.content) is not None
+    )
+
+# Length exponent for budgeted selection: ranking by score / tokens**r with
+# r < 1 favours dense messages without always preferring the shortest ones
+_DENSITY_EXPONENT = 0.7
+
 class RetentionCriteria:
     """
     Service for determining what to keep, summarize, or discard.
@@ -220,7 +488,9 @@ class RetentionCriteria:
         self,
         messages: List[Message],
         current_time: datetime,
-        current_task: Optional[str] = None
+        current_task: Optional[str] = None,
+        *,
+        out: Optional[Dict[str, List[Message]]] = None
     ) -> Dict[str, List[Message]]:
         """
         Classify messages into retention categories.
@@ -229,22 +499,97 @@ class RetentionCriteria:
             messages: List of messages
             current_time: Current timestamp
             current_task: Optional current task
+            out: Result of a previous call to reuse; its lists are cleared
+                and refilled instead of allocating new ones
         
         Returns:
-            Dictionary with categorized messages
+            Dictionary with categorized messages (out, if given)
         """
-        classified = {
-            "keep": [],
-            "summarize": [],
-            "discard": []
-        }
+        # A score of 0.8 already means "keep", so the keyword scan is skipped there
+        tokens, mandatory, optional_idx, scores = self._score_optional(
+            messages, current_time, current_task, scan_below=0.8
+        )
         
-        for message in messages:
-            score = self.importance_scorer.score_message(message, current_time, current_task)
-            category = self._categorize_by_score(score, message)
-            classified[category].append(message)
+        # Same rules as _categorize_by_score, evaluated as masks over all messages
+        keep_mask = mandatory.copy()
+        keep_mask[optional_idx] = scores >= 0.8
+        summarize_mask = np.zeros(len(messages), dtype=bool)
+        summarize_mask[optional_idx] = (scores < 0.8) & (scores >= 0.4)
         
-        return classified
+        return self._gather(messages, keep_mask, summarize_mask, out)
+    
+    def _score_optional(
+        self,
+        messages: List[Message],
+        current_time: datetime,
+        current_task: Optional[str] = None,
+        scan_below: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Extract token counts and score the messages that are not mandatory keeps.
+        
+        Args:
+            messages: List of messages
+            current_time: Current timestamp
+            current_task: Optional current task
+            scan_below: If set, score every non-system/user message first and
+                scan for critical keywords only where the score is below
+                this value; callers that keep such messages anyway need not
+                know whether they are mandatory
+        
+        Returns:
+            Tuple of (token counts, mandatory-keep mask, indices of the other
+            messages, their final scores)
+        """
+        n = len(messages)
+        tokens = np.fromiter((m.token_count for m in messages), dtype=np.int32, count=n)
+        roles = np.fromiter((m.role_code for m in messages), dtype=np.int8, count=n)
+        
+        # System/user roles are mandatory keeps; content is scanned only for the rest
+        mandatory = roles <= Role.USER
+        scorer = self.importance_scorer
+        
+        if scan_below is not None:
+            scored_idx = np.flatnonzero(~mandatory)
+            cols = scorer.build_columns([messages[i] for i in scored_idx])
+            scored = scorer.score_all(cols, current_time, current_task)
+            critical = np.zeros(len(scored_idx), dtype=bool)
+            for j in np.flatnonzero(scored < scan_below).tolist():
+                critical[j] = _CRITICAL_RE.search(messages[scored_idx[j]].content) is not None
+            mandatory[scored_idx[critical]] = True
+            return tokens, mandatory, scored_idx[~critical], scored[~critical]
+        
+        for i in np.flatnonzero(~mandatory).tolist():
+            mandatory[i] = _CRITICAL_RE.search(messages[i].content) is not None
+        
+        # Mandatory keeps do not depend on the score, so only the rest are scored
+        optional_idx = np.flatnonzero(~mandatory)
+        cols = scorer.build_columns([messages[i] for i in optional_idx])
+        scores = scorer.score_all(cols, current_time, current_task)
+        return tokens, mandatory, optional_idx, scores
+    
+    @staticmethod
+    def _gather(
+        messages: List[Message],
+        keep_mask: np.ndarray,
+        summarize_mask: np.ndarray,
+        out: Optional[Dict[str, List[Message]]] = None
+    ) -> Dict[str, List[Message]]:
+        """Split messages into keep/summarize/discard lists, preserving order."""
+        if out is None:
+            out = {"keep": [], "summarize": [], "discard": []}
+        discard_mask = ~(keep_mask | summarize_mask)
+        for category, mask in (
+            ("keep", keep_mask),
+            ("summarize", summarize_mask),
+            ("discard", discard_mask)
+        ):
+            bucket = out[category]
+            bucket.clear()
+            # One bulk extend per bucket (sized from the index array) rather
+            # than growing the list an element at a time
+            bucket.extend(map(messages.__getitem__, np.flatnonzero(mask).tolist()))
+        return out
     
     def _categorize_by_score(self, score: ImportanceScore, message: Message) -> str:
         """
@@ -260,9 +605,9 @@ class RetentionCriteria:
         # Mandatory keep: high importance, recent, or critical type
         if score.final_score >= 0.8:
             return "keep"
-        if message.role == "system" or message.role == "user":
+        if message.role_code <= Role.USER:
             return "keep"
-        if "error" in message.content.lower() or "critical" in message.content.lower():
+        if _CRITICAL_RE.search(message.content) is not None:
             return "keep"
         
         # Summarize: medium importance
@@ -277,57 +622,106 @@ class RetentionCriteria:
         messages: List[Message],
         target_tokens: int,
         current_time: datetime,
-        current_task: Optional[str] = None
+        current_task: Optional[str] = None,
+        keep_fraction: float = 0.7
     ) -> Dict[str, Any]:
         """
-        Create retention plan for messages.
+        Create a retention plan that fits target_tokens.
+        
+        Mandatory messages are always kept. The others are ranked by
+        score / tokens**_DENSITY_EXPONENT (importance per token, with a mild
+        preference for longer messages) and selected greedily, knapsack style:
+        - Keep band: top-ranked messages while kept tokens fit in
+          keep_fraction of the remaining budget
+        - Summarize band: next-ranked messages while their ~30% summaries
+          still fit in the budget
+        - Everything else, and any message scoring below 0.4, is discarded
+        If every candidate fits in the budget, all of them are kept.
         
         Args:
             messages: List of messages
             target_tokens: Target token count
             current_time: Current timestamp
             current_task: Optional current task
+            keep_fraction: Share of the optional budget spent on verbatim keeps
         
         Returns:
             Retention plan with actions for each message
         """
-        classified = self.classify_messages(messages, current_time, current_task)
+        tokens, mandatory, optional_idx, scores = self._score_optional(
+            messages, current_time, current_task
+        )
+        keep_mask = mandatory.copy()
+        summarize_mask = np.zeros(len(messages), dtype=bool)
+        
+        budget = target_tokens - int(tokens[mandatory].sum())
+        eligible = scores >= 0.4
+        candidates = optional_idx[eligible]
+        cand_tokens = tokens[candidates]
+        
+        if int(cand_tokens.sum()) <= budget:
+            keep_mask[candidates] = True
+        elif budget > 0:
+            density = scores[eligible] / np.maximum(cand_tokens, 1) ** _DENSITY_EXPONENT
+            order = np.argsort(-density, kind="stable")
+            ranked = candidates[order]
+            ranked_tokens = cand_tokens[order]
+            
+            # Token counts are non-negative, so each cumulative test selects a prefix
+            in_keep = np.cumsum(ranked_tokens) <= budget * keep_fraction
+            keep_mask[ranked[in_keep]] = True
+            
+            remaining = budget - int(ranked_tokens[in_keep].sum())
+            summary_cost = np.where(in_keep, 0.0, ranked_tokens * 0.3)
+            in_summarize = ~in_keep & (np.cumsum(summary_cost) <= remaining)
+            summarize_mask[ranked[in_summarize]] = True
+        
+        classified = self._gather(messages, keep_mask, summarize_mask)
+        
+        # Keep messages count in full, summarized ones at ~30%, discarded at 0
+        keep_tokens = int(tokens[keep_mask].sum())
+        summarize_tokens = int(tokens[summarize_mask].sum() * 0.3)
         
         plan = {
             "keep": classified["keep"],
             "summarize": classified["summarize"],
             "discard": classified["discard"],
             "target_tokens": target_tokens,
-            "estimated_tokens_after": self._estimate_tokens(classified)
+            "estimated_tokens_after": keep_tokens + summarize_tokens
         }
         
         return plan
-    
-    def _estimate_tokens(self, classified: Dict[str, List[Message]]) -> int:
-        """
-        Estimate tokens after retention plan.
-        
-        Args:
-            classified: Classified messages
-        
-        Returns:
-            Estimated token count
-        """
-        # Keep all "keep" messages
-        keep_tokens = sum(msg.token_count for msg in classified["keep"])
-        
-        # Summarize "summarize" messages (estimate 30% of original)
-        summarize_tokens = int(sum(msg.token_count for msg in classified["summarize"]) * 0.3)
-        
-        # Discard "discard" messages (0 tokens)
-        
-        return keep_tokens + summarize_tokens
 
 
 # ============================================================================
 # Retention Service
 # ============================================================================
 
+@dataclass(slots=True)
+class RetentionStreamState:
+    """
+    Running state for streaming retention (see RetentionService.on_message).
+    
+    This demonstrates bounded streaming retention:
+    - Kept messages in a min-heap by score, so the weakest is evicted first
+    - Optional kept tokens bounded by token_budget
+    - Lower-scoring messages buffered and summarized in batches
+    - At most max_summaries summaries; the oldest two are merged beyond that
+    
+    Mandatory messages (system/user roles, critical content) are never
+    evicted, so kept_tokens can exceed token_budget by up to their total;
+    that overflow grows with the number of mandatory messages in the stream.
+    """
+    token_budget: int
+    threshold: float = 0.6  # Score at or above which a message is kept verbatim
+    flush_size: int = 50  # Buffered messages per summary
+    max_summaries: int = 8  # Summaries kept before the oldest are merged
+    kept: List[Tuple[float, int, Message]] = field(default_factory=list)  # (score, seq, message)
+    kept_tokens: int = 0
+    pending: Deque[Message] = field(default_factory=deque)
+    summaries: List[Message] = field(default_factory=list)
+    seq: int = 0
+
 class RetentionService:
     """
     Service for applying retention criteria.
@@ -354,7 +748,8 @@ class RetentionService:
         messages: List[Message],
         target_tokens: int,
         current_time: datetime,
-        current_task: Optional[str] = None
+        current_task: Optional[str] = None,
+        max_return: Optional[int] = None
     ) -> List[Message]:
         """
         Apply retention criteria to messages.
@@ -364,9 +759,11 @@ class RetentionService:
             target_tokens: Target token count
             current_time: Current timestamp
             current_task: Optional current task
+            max_return: If set, return only the most recent max_return
+                retained messages
         
         Returns:
-            Retained messages (kept + summarized)
+            Retained messages (kept + summarized), oldest first
         """
         # Get retention plan
         plan = self.retention_criteria.get_retention_plan(
@@ -383,11 +780,88 @@ class RetentionService:
         
         # Discard "discard" messages (not added to retained)
         
-        # Sort by timestamp to maintain order
-        retained.sort(key=lambda m: m.timestamp)
+        # Sort by timestamp to maintain order: argsort a timestamp column
+        # (stable, so equal timestamps keep their relative order)
+        ts = np.fromiter(
+            (m.timestamp.timestamp() for m in retained), dtype=np.float64, count=len(retained)
+        )
+        if max_return is not None and max_return < len(retained):
+            # Only the newest max_return are needed: partition them out in
+            # O(M), then sort just that subset
+            if max_return <= 0:
+                return []
+            recent = np.sort(np.argpartition(ts, -max_return)[-max_return:])
+            order = recent[np.argsort(ts[recent], kind="stable")]
+        else:
+            order = np.argsort(ts, kind="stable")
+        retained = [retained[i] for i in order]
         
         return retained
     
+    def on_message(
+        self,
+        message: Message,
+        state: RetentionStreamState,
+        current_time: Optional[datetime] = None,
+        current_task: Optional[str] = None
+    ) -> None:
+        """
+        Apply retention to one newly arrived message (stream greedy).
+        
+        Messages scoring at least state.threshold (and mandatory messages)
+        are kept; when kept tokens exceed the budget, the lowest-scoring
+        optional message is moved to the summarize buffer. Others scoring
+        at least 0.4 are buffered, and messages below 0.4 are discarded.
+        A full buffer is flushed into one summary message, and the oldest
+        summaries are merged to keep at most state.max_summaries. Mandatory
+        messages are never evicted, so they can push kept_tokens past
+        state.token_budget.
+        
+        Args:
+            message: Newly arrived message
+            state: Stream state, updated in place
+            current_time: Arrival time (defaults to message.timestamp)
+            current_task: Optional current task
+        """
+        if _is_mandatory_keep(message):
+            score = float("inf")
+        else:
+            score = self.importance_scorer.score_message(
+                message, current_time or message.timestamp, current_task
+            ).final_score
+        
+        if score >= state.threshold:
+            heapq.heappush(state.kept, (score, state.seq, message))
+            state.seq += 1
+            state.kept_tokens += message.token_count
+            while state.kept_tokens > state.token_budget and state.kept[0][0] != float("inf"):
+                _, _, evicted = heapq.heappop(state.kept)
+                state.kept_tokens -= evicted.token_count
+                state.pending.append(evicted)
+        elif score >= 0.4:
+            state.pending.append(message)
+        
+        if len(state.pending) >= state.flush_size:
+            state.summaries.extend(self._summarize_messages(list(state.pending)))
+            state.pending.clear()
+            # Merge the two oldest summaries until the list is back in bounds
+            while len(state.summaries) > max(1, state.max_summaries):
+                state.summaries[:2] = self._summarize_messages(state.summaries[:2])
+    
+    def stream_retained(self, state: RetentionStreamState) -> List[Message]:
+        """
+        Current retained context of a stream, in timestamp order.
+        
+        Args:
+            state: Stream state
+        
+        Returns:
+            Summaries, kept messages and not yet summarized messages
+        """
+        retained = state.summaries + [m for _, _, m in state.kept] + list(state.pending)
+        retained.sort(key=lambda m: m.timestamp)
+        return retained
+    
     def _summarize_messages(self, messages: List[Message]) -> List[Message]:
         """
         Summarize a group of messages.
@@ -401,9 +875,20 @@ class RetentionService:
         if not messages:
             return []
         
-        # Combine messages into summary
-        combined_content = "\n".join([f"{msg.role}: {msg.content[:100]}..." for msg in messages])
-        summary_content = f"[Summary of {len(messages)} messages] {combined_content[:500]}"
+        # Combine messages into summary; only the first 500 characters are
+        # used, so stop collecting lines once that much has been gathered
+        parts = []
+        total = 0
+        for msg in messages:
+            line = f"{msg.role}: {msg.content[:100]}..."
+            parts.append(line)
+            total += len(line) + 1
+            if total >= 500:
+                break
+        combined_content = "\n".join(parts)[:500]
+        # Merged summaries count the messages they already stand for
+        count = sum(msg.metadata.get("summarized_count", 1) for msg in messages)
+        summary_content = f"[Summary of {count} messages] {combined_content}"
         
         # Create summary message
         summary_message = Message(
@@ -412,7 +897,7 @@ class RetentionService:
             timestamp=messages[0].timestamp,
             token_count=len(summary_content) // 4,
             importance_score=0.6,
-            metadata={"summarized_count": len(messages), "original_messages": [m.content[:50] for m in messages]}
+            metadata={"summarized_count": count, "original_messages": [m.content[:50] for m in messages]}
         )
         
         return [summary_message]
@@ -0,0 +1,34 @@
+"""
+Checks MessageBuffer token bookkeeping and the compression trigger built on it.
+
+Run with: pytest .cursor/rules/agents/context-compression-and-optimization
+"""
+
+from datetime import datetime
+
+from examples_compression import ContextCompressionService, Message, MessageBuffer, TokenCounter
+
+
+def _buffer(n: int, chars: int) -> MessageBuffer:
+    buf = MessageBuffer()
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    for i in range(n):
+        buf.append(Message(role="user", content=f"{i:03d} " + "x" * chars, timestamp=now))
+    return buf
+
+
+def test_buffer_total_matches_message_counts():
+    buf = _buffer(20, 400)
+
+    assert buf.total_tokens() == sum(msg.token_count for msg in buf)
+    assert all(msg.token_count > 0 for msg in buf)
+
+
+def test_uncounted_buffer_triggers_compression():
+    buf = _buffer(20, 400)
+    service = ContextCompressionService(TokenCounter())
+
+    compressed = service.compress_context(buf, 1000)
+
+    assert len(compressed) < len(buf)
+    assert sum(msg.token_count for msg in compressed) <= 1000
@@ -0,0 +1,63 @@
+"""
+Checks that batch retention classification matches the scalar scoring rules.
+
+Run with: pytest .cursor/rules/agents/context-compression-and-optimization
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from examples_compression import Message
+from examples_retention import ImportanceScorer, RetentionCriteria
+
+
+_WORDS = ("alpha", "beta", "gamma", "delta", "omega", "sigma", "error", "note", "plan", "data")
+_ROLES = ("assistant", "tool", "user", "system")
+_AGES = (0, 299, 300, 301, 1799, 1800, 3600, 7199, 7200, 9000)
+
+
+def _scalar_categories(criteria, messages, now, task):
+    """Categorize one message at a time with score_message/_categorize_by_score."""
+    scorer = criteria.importance_scorer
+    return [
+        criteria._categorize_by_score(scorer.score_message(m, now, task), m)
+        for m in messages
+    ]
+
+
+def _batch_categories(criteria, messages, now, task):
+    """Categorize with classify_messages, mapped back to message order."""
+    classified = criteria.classify_messages(messages, now, task)
+    by_id = {id(m): category for category, bucket in classified.items() for m in bucket}
+    return [by_id[id(m)] for m in messages]
+
+
+def test_batch_matches_scalar_at_score_boundary():
+    # Relevance 1/3 puts this tool message at 0.39999999999999997: "discard"
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    task = "alpha beta gamma delta omega sigma"
+    messages = [Message(role="tool", content="alpha result", timestamp=now)]
+    criteria = RetentionCriteria(ImportanceScorer())
+
+    assert _batch_categories(criteria, messages, now, task) == ["discard"]
+    assert _scalar_categories(criteria, messages, now, task) == ["discard"]
+
+
+def test_batch_matches_scalar_randomized():
+    rng = random.Random(1234)
+    criteria = RetentionCriteria(ImportanceScorer())
+    now = datetime(2025, 1, 1, 12, 0, 0, 123456)
+
+    for _ in range(300):
+        task = " ".join(rng.sample(_WORDS, rng.randint(0, 6))) or None
+        messages = [
+            Message(
+                role=rng.choice(_ROLES),
+                content=" ".join(rng.choices(_WORDS, k=rng.randint(1, 5))),
+                timestamp=now - timedelta(seconds=rng.choice(_AGES),
+                                          microseconds=rng.choice((0, 1, 999999))),
+            )
+            for _ in range(rng.randint(1, 20))
+        ]
+        assert (_batch_categories(criteria, messages, now, task)
+                == _scalar_categories(criteria, messages, now, task))
@@ -5,10 +5,13 @@ This file demonstrates BudgetState TypedDict definition and cost tracking implem
 Reference this example from RULE.mdc using @examples_budget_state.py syntax.
 """
 
-from typing import TypedDict, Dict, Optional
+from collections import defaultdict
+from typing import TypedDict, Any, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass, field
 
+import numpy as np
+
 
 # ============================================================================
 # BudgetState TypedDict
@@ -32,11 +35,11 @@ class BudgetState(TypedDict, total=False):
     
     # Per-model tracking
     model_costs: Dict[str, float]  # model_name -> cost
-    model_tokens: Dict[str, int]    # model_name -> token_count
+    model_tokens: Dict[str, int]  # model_name -> token_count
     
     # Per-node tracking
-    node_costs: Dict[str, float]    # node_name -> cost
-    node_tokens: Dict[str, int]     # node_name -> token_count
+    node_costs: Dict[str, float]  # node_name -> cost
+    node_tokens: Dict[str, int]  # node_name -> token_count
     
     # Session metadata
     session_start_time: datetime
@@ -46,6 +49,81 @@ class BudgetState(TypedDict, total=False):
     budget_exceeded: bool
 
 
+class IndexedCostTotals:
+    """
+    Per-name cost and token totals in indexed NumPy columns.
+    
+    This demonstrates an opt-in accumulator for hot paths (batch replays,
+    top-k scans over costs). It is never stored in BudgetState, whose
+    name-keyed dicts stay the checkpointed contract; convert with
+    from_dicts and CostTracker.get_cost_breakdown.
+    """
+    
+    __slots__ = ("index", "costs", "tokens")
+    
+    def __init__(self, capacity: int = 4):
+        """
+        Initialize empty totals.
+        
+        Args:
+            capacity: Initial column capacity
+        """
+        self.index: Dict[str, int] = {}
+        self.costs = np.zeros(max(1, capacity))
+        self.tokens = np.zeros(max(1, capacity), dtype=np.int64)
+    
+    @classmethod
+    def from_dicts(cls, costs: Dict[str, float], tokens: Dict[str, int]) -> "IndexedCostTotals":
+        """
+        Build totals from name-keyed dicts (e.g. state["model_costs"]/["model_tokens"]).
+        
+        Args:
+            costs: name -> cost
+            tokens: name -> token_count
+            
+        Returns:
+            IndexedCostTotals holding the same totals
+        """
+        totals = cls(capacity=len(costs))
+        for name in dict.fromkeys((*costs, *tokens)):
+            i = totals.slot(name)
+            totals.costs[i] = costs.get(name, 0.0)
+            totals.tokens[i] = tokens.get(name, 0)
+        return totals
+    
+    def slot(self, name: str) -> int:
+        """
+        Get the column slot for name, assigning the next free one on first use.
+        
+        The columns grow geometrically, so the set of names can still change;
+        once it stabilizes an update is one lookup plus two array increments.
+        """
+        i = self.index.setdefault(name, len(self.index))
+        if i == len(self.costs):
+            self.costs = np.concatenate((self.costs, np.zeros(i)))
+            self.tokens = np.concatenate((self.tokens, np.zeros(i, dtype=np.int64)))
+        return i
+    
+    def add_many(self, names: List[str], costs: np.ndarray, tokens: np.ndarray) -> None:
+        """
+        Scatter-add per-call costs and tokens into each call's name slot.
+        
+        Args:
+            names: Name of each call
+            costs: Cost of each call
+            tokens: Token count of each call
+        """
+        slots = {name: self.slot(name) for name in dict.fromkeys(names)}  # first-seen order
+        idx = np.fromiter(map(slots.__getitem__, names), dtype=np.intp, count=len(names))
+        np.add.at(self.costs, idx, costs)
+        np.add.at(self.tokens, idx, tokens)
+    
+    def items(self) -> Iterable[Tuple[str, float, int]]:
+        """Yield (name, cost, token_count) in slot order."""
+        for name, i in self.index.items():
+            yield name, float(self.costs[i]), int(self.tokens[i])
+
+
 # ============================================================================
 # Model Pricing Configuration
 # ============================================================================
@@ -122,6 +200,7 @@ class PricingRegistry:
             output_price_per_1k=0.03,
             provider="unknown"
         )
+        self._lookup: Optional[Tuple[Dict[str, int], np.ndarray, np.ndarray]] = None
     
     def get_pricing(self, model_name: str) -> ModelPricing:
         """
@@ -143,6 +222,26 @@ class PricingRegistry:
             pricing: ModelPricing configuration
         """
         self._pricing[pricing.model_name] = pricing
+        self._lookup = None
+    
+    def build_lookup_arrays(self) -> Tuple[Dict[str, int], np.ndarray, np.ndarray]:
+        """
+        Get pricing as parallel rate arrays for vectorized cost calculation.
+        
+        The last slot holds the default pricing, so unknown models map to
+        len(name_to_idx). Arrays are rebuilt only after register_pricing.
+        
+        Returns:
+            Tuple of (name_to_idx, input_rates, output_rates); rates are USD
+            per 1K tokens
+        """
+        if self._lookup is None:
+            pricings = list(self._pricing.values()) + [self._default_pricing]
+            name_to_idx = {p.model_name: i for i, p in enumerate(pricings[:-1])}
+            input_rates = np.array([p.input_price_per_1k for p in pricings], dtype=np.float64)
+            output_rates = np.array([p.output_price_per_1k for p in pricings], dtype=np.float64)
+            self._lookup = (name_to_idx, input_rates, output_rates)
+        return self._lookup
 
 
 # ============================================================================
@@ -177,6 +276,10 @@ class CostTracker:
         self.pricing_registry = pricing_registry
         self.budget_limit_usd = budget_limit_usd
         self.warning_threshold = warning_threshold
+        
+        # Last check_budget_status result with the inputs it was computed
+        # from; kept here rather than in the (checkpointed) graph state
+        self._status_cache: Optional[Tuple[Tuple[Any, ...], Dict[str, Any]]] = None
     
     def calculate_cost(
         self,
@@ -202,13 +305,42 @@ class CostTracker:
         
         return input_cost + output_cost
     
+    def calculate_costs_batch(
+        self,
+        model_names: List[str],
+        input_tokens: np.ndarray,
+        output_tokens: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate costs for many LLM calls at once (e.g. replaying a log).
+        
+        Args:
+            model_names: Model name of each call
+            input_tokens: Input tokens of each call
+            output_tokens: Output tokens of each call
+            
+        Returns:
+            float64 array of costs in USD, aligned with model_names
+        """
+        name_to_idx, input_rates, output_rates = self.pricing_registry.build_lookup_arrays()
+        default_idx = len(name_to_idx)
+        idx = np.fromiter(
+            (name_to_idx.get(m, default_idx) for m in model_names),
+            dtype=np.intp,
+            count=len(model_names)
+        )
+        input_tokens = np.asarray(input_tokens, dtype=np.float64)
+        output_tokens = np.asarray(output_tokens, dtype=np.float64)
+        return (input_tokens * input_rates[idx] + output_tokens * output_rates[idx]) / 1000
+    
     def update_budget_state(
         self,
         state: BudgetState,
         model_name: str,
         node_name: str,
         input_tokens: int,
-        output_tokens: int
+        output_tokens: int,
+        now: Optional[datetime] = None
     ) -> BudgetState:
         """
         Update budget state with new LLM call costs.
@@ -219,6 +351,8 @@ class CostTracker:
             node_name: Name of the node making the call
             input_tokens: Number of input tokens
             output_tokens: Number of output tokens
+            now: Timestamp of the call; defaults to datetime.now(). Batch
+                replays can pass a precomputed or recorded timestamp
             
         Returns:
             Updated budget state
@@ -227,19 +361,7 @@ class CostTracker:
         cost = self.calculate_cost(model_name, input_tokens, output_tokens)
         total_tokens = input_tokens + output_tokens
         
-        # Initialize state if needed
-        if "total_input_tokens" not in state:
-            state["total_input_tokens"] = 0
-            state["total_output_tokens"] = 0
-            state["total_tokens"] = 0
-            state["total_cost_usd"] = 0.0
-            state["model_costs"] = {}
-            state["model_tokens"] = {}
-            state["node_costs"] = {}
-            state["node_tokens"] = {}
-            state["budget_limit_usd"] = self.budget_limit_usd
-            state["budget_warning_threshold"] = self.warning_threshold
-            state["budget_exceeded"] = False
+        self._ensure_initialized(state)
         
         # Update cumulative totals
         state["total_input_tokens"] += input_tokens
@@ -248,29 +370,187 @@ class CostTracker:
         state["total_cost_usd"] += cost
         
         # Update per-model tracking
-        state["model_costs"][model_name] = state["model_costs"].get(model_name, 0.0) + cost
-        state["model_tokens"][model_name] = state["model_tokens"].get(model_name, 0) + total_tokens
+        state["model_costs"][model_name] += cost
+        state["model_tokens"][model_name] += total_tokens
         
         # Update per-node tracking
-        state["node_costs"][node_name] = state["node_costs"].get(node_name, 0.0) + cost
-        state["node_tokens"][node_name] = state["node_tokens"].get(node_name, 0) + total_tokens
+        state["node_costs"][node_name] += cost
+        state["node_tokens"][node_name] += total_tokens
         
-        # Update timestamps
-        state["last_update_time"] = datetime.now()
+        return self._finish_update(state, now)
+    
+    def update_budget_state_batch(
+        self,
+        state: BudgetState,
+        model_names: List[str],
+        node_name: str,
+        input_tokens: np.ndarray,
+        output_tokens: np.ndarray,
+        now: Optional[datetime] = None
+    ) -> BudgetState:
+        """
+        Update budget state with a batch of LLM calls from one node.
+        
+        Equivalent to calling update_budget_state once per call, but costs
+        are computed with calculate_costs_batch and each total is updated once.
+        
+        Args:
+            state: Current budget state
+            model_names: Model name of each call
+            node_name: Name of the node making the calls
+            input_tokens: Input tokens of each call
+            output_tokens: Output tokens of each call
+            now: Timestamp of the batch; defaults to datetime.now()
+            
+        Returns:
+            Updated budget state
+        """
+        input_tokens = np.asarray(input_tokens, dtype=np.int64)
+        output_tokens = np.asarray(output_tokens, dtype=np.int64)
+        costs = self.calculate_costs_batch(model_names, input_tokens, output_tokens)
+        call_tokens = input_tokens + output_tokens
+        batch_cost = float(costs.sum())
+        batch_tokens = int(call_tokens.sum())
+        
+        self._ensure_initialized(state)
+        
+        # Update cumulative totals
+        state["total_input_tokens"] += int(input_tokens.sum())
+        state["total_output_tokens"] += int(output_tokens.sum())
+        state["total_tokens"] += batch_tokens
+        state["total_cost_usd"] += batch_cost
+        
+        # Update per-model tracking: group the batch by model in indexed
+        # columns, then touch each model's dict entry once
+        batch_models = IndexedCostTotals(capacity=len(model_names))
+        batch_models.add_many(model_names, costs, call_tokens)
+        for name, model_cost, model_tokens in batch_models.items():
+            state["model_costs"][name] += model_cost
+            state["model_tokens"][name] += model_tokens
+        
+        # Update per-node tracking
+        state["node_costs"][node_name] += batch_cost
+        state["node_tokens"][node_name] += batch_tokens
+        
+        return self._finish_update(state, now)
+    
+    def _ensure_initialized(self, state: BudgetState) -> None:
+        """Initialize totals, per-key maps and limits on first use."""
+        if "total_input_tokens" not in state:
+            state["total_input_tokens"] = 0
+            state["total_output_tokens"] = 0
+            state["total_tokens"] = 0
+            state["total_cost_usd"] = 0.0
+            # defaultdicts so each per-key update is a single hash probe
+            state["model_costs"] = defaultdict(float)
+            state["model_tokens"] = defaultdict(int)
+            state["node_costs"] = defaultdict(float)
+            state["node_tokens"] = defaultdict(int)
+            state["budget_limit_usd"] = self.budget_limit_usd
+            state["budget_warning_threshold"] = self.warning_threshold
+            state["budget_exceeded"] = False
+    
+    def _finish_update(self, state: BudgetState, now: Optional[datetime]) -> BudgetState:
+        """Stamp update time, flag budget overrun and refresh the cached status."""
+        # Update timestamps (one clock read per update)
+        if now is None:
+            now = datetime.now()
+        state["last_update_time"] = now
         if "session_start_time" not in state:
-            state["session_start_time"] = datetime.now()
+            state["session_start_time"] = now
         
         # Check budget limits
         budget_usage = state["total_cost_usd"] / state["budget_limit_usd"]
         if budget_usage >= 1.0:
             state["budget_exceeded"] = True
         
+        # Refresh the derived status so guardrail checks between updates are lookups
+        self.check_budget_status(state)
+        
         return state
     
-    def check_budget_status(self, state: BudgetState) -> Dict[str, any]:
+    def get_cost_breakdown(
+        self,
+        state: BudgetState,
+        model_totals: Optional[IndexedCostTotals] = None,
+        node_totals: Optional[IndexedCostTotals] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-model and per-node totals keyed by name, for reporting.
+        
+        Args:
+            state: Current budget state
+            model_totals: Indexed per-model totals to report instead of the
+                state's model_costs/model_tokens
+            node_totals: Indexed per-node totals to report instead of the
+                state's node_costs/node_tokens
+            
+        Returns:
+            Dictionary with model_costs, model_tokens, node_costs and
+            node_tokens, each mapping name -> total (plain dicts, so the
+            result can be written back into the state)
+        """
+        breakdown: Dict[str, Dict[str, Any]] = {}
+        for prefix, totals in (("model", model_totals), ("node", node_totals)):
+            if totals is None:
+                breakdown[f"{prefix}_costs"] = dict(state.get(f"{prefix}_costs", {}))
+                breakdown[f"{prefix}_tokens"] = dict(state.get(f"{prefix}_tokens", {}))
+            else:
+                breakdown[f"{prefix}_costs"] = {name: cost for name, cost, _ in totals.items()}
+                breakdown[f"{prefix}_tokens"] = {name: tokens for name, _, tokens in totals.items()}
+        return breakdown
+    
+    def check_budget_status(self, state: BudgetState) -> Dict[str, Any]:
         """
         Check current budget status.
         
+        Args:
+            state: Current budget state
+            
+        Returns:
+            Dictionary with budget status information; cached on the tracker
+            and shared between calls, so treat it as read-only
+        """
+        # The status only changes with these inputs, so it is recomputed only
+        # when one of them differs from the cached entry (e.g. after
+        # update_budget_state, or on a copied state with a projected cost).
+        # One tracker may serve several states, so missing keys stay None and
+        # the tracker defaults are part of the key.
+        key = (
+            state.get("total_cost_usd"),
+            state.get("budget_limit_usd"),
+            state.get("budget_warning_threshold"),
+            state.get("budget_exceeded", False),
+            self.budget_limit_usd,
+            self.warning_threshold
+        )
+        cached = self._status_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        status = self._compute_budget_status(state)
+        self._status_cache = (key, status)
+        return status
+    
+    def get_usage_percent(self, state: BudgetState) -> float:
+        """
+        Fraction of the budget used, without building a status dict.
+        
+        Args:
+            state: Current budget state
+            
+        Returns:
+            Spend / limit, or 0.0 when there is no spend or no positive limit
+        """
+        budget_limit = state.get("budget_limit_usd", self.budget_limit_usd)
+        if budget_limit <= 0:
+            return 0.0
+        return state.get("total_cost_usd", 0.0) / budget_limit
+    
+    def _compute_budget_status(self, state: BudgetState) -> Dict[str, Any]:
+        """
+        Compute budget status from state.
+        
         Args:
             state: Current budget state
             
@@ -289,7 +569,7 @@ class CostTracker:
         budget_used = state["total_cost_usd"]
         budget_limit = state.get("budget_limit_usd", self.budget_limit_usd)
         budget_remaining = max(0.0, budget_limit - budget_used)
-        budget_usage_percent = budget_used / budget_limit if budget_limit > 0 else 0.0
+        budget_usage_percent = self.get_usage_percent(state)
         
         warning_threshold = state.get("budget_warning_threshold", self.warning_threshold)
         is_warning = budget_usage_percent >= warning_threshold
@@ -5,10 +5,15 @@ This file demonstrates threshold checking and graceful degradation patterns.
 Reference this example from RULE.mdc using @examples_guardrails.py syntax.
 """
 
-from typing import TypedDict, Dict, Any, Optional
-from enum import Enum
+import bisect
+from operator import itemgetter
+from types import MappingProxyType
+from typing import TypedDict, Dict, Any, List, Mapping, Optional, Tuple
+from enum import IntEnum
 from dataclasses import dataclass
 
+import numpy as np
+
 # Note: In actual implementation, import from your actual modules
 # from your_project.budget import BudgetState, CostTracker
 # For this example, we reference the types from examples_budget_state.py
@@ -27,12 +32,20 @@ BudgetState = TypedDict('BudgetState', {
 # For this example, we use a type hint
 CostTracker = Any
 
+# Shared read-only stand-in for a missing "usage" block in LLM results
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+# Budget fields read by the pre-call check, fetched in one call
+_GET_BUDGET_FIELDS = itemgetter(
+    "total_cost_usd", "budget_limit_usd", "budget_warning_threshold", "budget_exceeded"
+)
+
 
 # ============================================================================
 # Guardrail Enforcement
 # ============================================================================
 
-class GuardrailAction(Enum):
+class GuardrailAction(IntEnum):
     """
     Actions to take when budget thresholds are reached.
     
@@ -41,14 +54,17 @@ class GuardrailAction(Enum):
     - WARN: Log warning but continue
     - DEGRADE: Switch to cheaper models/reduced context
     - HALT: Stop execution immediately
+    
+    Values are ordered by severity, so actions compare as integers
+    (e.g. action >= GuardrailAction.DEGRADE) and index dispatch tables.
     """
-    CONTINUE = "continue"
-    WARN = "warn"
-    DEGRADE = "degrade"
-    HALT = "halt"
+    CONTINUE = 0
+    WARN = 1
+    DEGRADE = 2
+    HALT = 3
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GuardrailConfig:
     """
     Configuration for budget guardrails.
@@ -68,6 +84,55 @@ class GuardrailConfig:
     context_reduction_factor: float = 0.5  # Reduce to 50% of original
 
 
+def _make_decider(thresholds: tuple, actions: tuple):
+    """
+    Build the guardrail decision function for a fixed threshold ladder.
+    
+    The config is fixed for the life of a guardrail, so its thresholds and
+    soft-band action are bound into the returned function once, leaving only
+    comparisons on the per-call path. Spend is compared in USD rather than
+    dividing by the limit.
+    
+    Args:
+        thresholds: Ascending usage thresholds (fractions of the limit);
+            (soft, hard) or (hard,)
+        actions: Action per threshold band; None for the band below all
+    
+    Returns:
+        Function (total_cost, budget_limit, warning_threshold) -> GuardrailAction,
+        for a positive budget_limit
+    """
+    HALT = GuardrailAction.HALT
+    WARN = GuardrailAction.WARN
+    CONTINUE = GuardrailAction.CONTINUE
+    
+    if len(thresholds) == 2:
+        soft, hard = thresholds
+        soft_action = actions[1]
+        
+        def decide(total_cost: float, budget_limit: float,
+                   warning_threshold: float) -> GuardrailAction:
+            if total_cost >= budget_limit or total_cost >= budget_limit * hard:
+                return HALT
+            if total_cost >= budget_limit * soft:
+                return soft_action
+            if total_cost >= budget_limit * warning_threshold:
+                return WARN
+            return CONTINUE
+    else:
+        (hard,) = thresholds
+        
+        def decide(total_cost: float, budget_limit: float,
+                   warning_threshold: float) -> GuardrailAction:
+            if total_cost >= budget_limit or total_cost >= budget_limit * hard:
+                return HALT
+            if total_cost >= budget_limit * warning_threshold:
+                return WARN
+            return CONTINUE
+    
+    return decide
+
+
 class BudgetGuardrail:
     """
     Budget guardrail enforcement service.
@@ -79,6 +144,8 @@ class BudgetGuardrail:
     - Hard halt on budget exceeded
     """
     
+    _MSG_TEMPLATE = "Budget limit of ${limit:.2f} exceeded. Current cost: ${used:.2f}"
+    
     def __init__(
         self,
         cost_tracker: CostTracker,
@@ -93,36 +160,171 @@ class BudgetGuardrail:
         """
         self.cost_tracker = cost_tracker
         self.config = config or GuardrailConfig()
+        
+        # Usage thresholds in ascending order and the action for each band
+        # (band 0, below the soft limit, is resolved from the warning flag).
+        # Built once from the config; rebuild the guardrail if config changes.
+        soft = self.config.soft_limit_threshold
+        hard = self.config.hard_limit_threshold
+        soft_action = (
+            GuardrailAction.DEGRADE if self.config.enable_graceful_degradation
+            else GuardrailAction.HALT
+        )
+        if soft < hard:
+            self._thresholds = (soft, hard)
+            self._actions = (None, soft_action, GuardrailAction.HALT)
+        else:  # soft band is unreachable; the hard limit takes precedence
+            self._thresholds = (hard,)
+            self._actions = (None, GuardrailAction.HALT)
+        self._decide = _make_decider(self._thresholds, self._actions)
+        
+        # Last decision made by check_guardrail, keyed by every input it used
+        self._last: Optional[Tuple[Tuple[float, float, float, bool], GuardrailAction]] = None
     
-    def check_guardrail(self, state: BudgetState) -> GuardrailAction:
+    def check_guardrail(self, state: Mapping[str, Any]) -> GuardrailAction:
         """
         Check budget status and determine guardrail action.
         
+        The state is only read, never written, so a read-only view
+        (MappingProxyType) or an overlay such as
+        ChainMap({"total_cost_usd": projected}, state) can be passed
+        instead of a copy.
+        
         Args:
             state: Current budget state
             
         Returns:
             GuardrailAction to take
         """
-        status = self.cost_tracker.check_budget_status(state)
+        used = state.get("total_cost_usd")
+        if used is None:
+            return self._check_from_status(state)
         
-        if status["is_exceeded"]:
-            return GuardrailAction.HALT
+        # Edges between nodes that made no LLM call see the same inputs again;
+        # reuse the last decision (the key holds every input, so a budget
+        # update or a different state simply misses)
+        key = (
+            used,
+            state.get("budget_limit_usd", self.cost_tracker.budget_limit_usd),
+            state.get("budget_warning_threshold", self.cost_tracker.warning_threshold),
+            state.get("budget_exceeded", False),
+        )
+        last = self._last
+        if last is not None and last[0] == key:
+            return last[1]
+        
+        action = self.check_guardrail_raw(*key)
+        self._last = (key, action)
+        return action
+    
+    def check_guardrail_raw(
+        self,
+        total_cost: float,
+        budget_limit: float,
+        warning_threshold: Optional[float] = None,
+        exceeded: bool = False
+    ) -> GuardrailAction:
+        """
+        Determine guardrail action from bare spend figures.
+        
+        Same decision as check_guardrail for a state with recorded spend,
+        without needing a state dict (e.g. for projected costs).
         
-        if status["budget_usage_percent"] >= self.config.hard_limit_threshold:
+        Args:
+            total_cost: Spend to evaluate (USD)
+            budget_limit: Budget limit (USD); non-positive means no limit
+            warning_threshold: Warning fraction (defaults to the tracker's)
+            exceeded: Whether the budget was already flagged as exceeded
+            
+        Returns:
+            GuardrailAction to take
+        """
+        if exceeded:
             return GuardrailAction.HALT
         
-        if status["budget_usage_percent"] >= self.config.soft_limit_threshold:
-            if self.config.enable_graceful_degradation:
-                return GuardrailAction.DEGRADE
+        if warning_threshold is None:
+            warning_threshold = self.cost_tracker.warning_threshold
+        if budget_limit <= 0:
+            # No limit means usage is 0.0
+            action = self._actions[bisect.bisect_right(self._thresholds, 0.0)]
+            if action is not None:
+                return action
+            return GuardrailAction.WARN if warning_threshold <= 0.0 else GuardrailAction.CONTINUE
+        
+        return self._decide(total_cost, budget_limit, warning_threshold)
+    
+    def _check_from_status(self, state: Mapping[str, Any]) -> GuardrailAction:
+        """
+        Determine guardrail action when spend or a positive limit is missing.
+        
+        Follows check_budget_status semantics for those states (usage is
+        0.0, and without recorded spend nothing is exceeded or warned about)
+        using the bare usage fraction instead of a status dict.
+        
+        Args:
+            state: Current budget state
+            
+        Returns:
+            GuardrailAction to take
+        """
+        usage = self.cost_tracker.get_usage_percent(state)
+        has_spend = "total_cost_usd" in state
+        
+        if has_spend and (state.get("budget_exceeded", False) or usage >= 1.0):
             return GuardrailAction.HALT
         
-        if status["is_warning"]:
+        action = self._actions[bisect.bisect_right(self._thresholds, usage)]
+        if action is not None:
+            return action
+        
+        warning = state.get("budget_warning_threshold", self.cost_tracker.warning_threshold)
+        if has_spend and usage >= warning:
             return GuardrailAction.WARN
         
         return GuardrailAction.CONTINUE
     
-    def should_halt(self, state: BudgetState) -> bool:
+    def check_plan(self, state: Mapping[str, Any], estimated_costs_usd: np.ndarray) -> np.ndarray:
+        """
+        Guardrail action for each step of a multi-call plan, in one pass.
+        
+        Step i is judged on the spend projected after calls 0..i, the same
+        decision check_guardrail_raw gives for that projected spend.
+        
+        Args:
+            state: Current budget state
+            estimated_costs_usd: Estimated cost of each planned call (USD)
+            
+        Returns:
+            int8 array of GuardrailAction values, one per planned call
+        """
+        costs = np.asarray(estimated_costs_usd, dtype=np.float64)
+        projected = state.get("total_cost_usd", 0.0) + np.cumsum(costs)
+        limit = state.get("budget_limit_usd", self.cost_tracker.budget_limit_usd)
+        warning = state.get("budget_warning_threshold", self.cost_tracker.warning_threshold)
+        
+        if state.get("budget_exceeded", False) or limit <= 0:
+            # The decision does not depend on spend here
+            action = self.check_guardrail_raw(
+                0.0, limit, warning, state.get("budget_exceeded", False)
+            )
+            return np.full(len(costs), action, dtype=np.int8)
+        
+        # Same ladder as self._decide, in USD: band lookup, then warning and hard limit
+        usd_thresholds = np.array([limit * t for t in self._thresholds])
+        band_actions = np.array(
+            [-1 if a is None else a for a in self._actions], dtype=np.int8
+        )
+        actions = band_actions[np.searchsorted(usd_thresholds, projected, side="right")]
+        unbanded = actions < 0
+        actions[unbanded] = np.where(
+            projected[unbanded] >= limit * warning,
+            GuardrailAction.WARN,
+            GuardrailAction.CONTINUE
+        )
+        actions[projected >= limit] = GuardrailAction.HALT
+        return actions
+    
+    def should_halt(self, state: Mapping[str, Any]) -> bool:
         """
         Check if execution should be halted.
         
@@ -135,17 +337,23 @@ class BudgetGuardrail:
         action = self.check_guardrail(state)
         return action == GuardrailAction.HALT
     
-    def get_degradation_config(self, state: BudgetState) -> Optional[Dict[str, Any]]:
+    def get_degradation_config(
+        self,
+        state: Mapping[str, Any],
+        action: Optional[GuardrailAction] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Get configuration for graceful degradation.
         
         Args:
             state: Current budget state
+            action: Guardrail action already determined for state, if any
             
         Returns:
             Degradation configuration or None if not needed
         """
-        action = self.check_guardrail(state)
+        if action is None:
+            action = self.check_guardrail(state)
         
         if action != GuardrailAction.DEGRADE:
             return None
@@ -165,22 +373,29 @@ class BudgetGuardrail:
         
         return config
     
-    def create_budget_exceeded_error(self, state: BudgetState) -> Dict[str, Any]:
+    def create_budget_exceeded_error(
+        self,
+        state: BudgetState,
+        status: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Create error response for budget exceeded.
         
         Args:
             state: Current budget state
+            status: Budget status already obtained for state, if any
             
         Returns:
             Error response dictionary
         """
-        status = self.cost_tracker.check_budget_status(state)
+        if status is None:
+            status = self.cost_tracker.check_budget_status(state)
+        limit = state.get("budget_limit_usd", 0)
         
         return {
             "error": "budget_exceeded",
-            "message": f"Budget limit of ${state.get('budget_limit_usd', 0):.2f} exceeded. Current cost: ${status['budget_used']:.2f}",
-            "budget_limit_usd": state.get("budget_limit_usd", 0),
+            "message": self._MSG_TEMPLATE.format(limit=limit, used=status["budget_used"]),
+            "budget_limit_usd": limit,
             "current_cost_usd": status["budget_used"],
             "budget_usage_percent": status["budget_usage_percent"],
             "suggestion": "Retry with a higher budget limit or simplify your request",
@@ -225,13 +440,14 @@ def budget_aware_node(
     Raises:
         BudgetExceededError: If budget is exceeded
     """
-    # Check if we should halt
-    if guardrail.should_halt(state):
+    # Check if we should halt (one decision, reused for degradation)
+    action = guardrail.check_guardrail(state)
+    if action == GuardrailAction.HALT:
         error = guardrail.create_budget_exceeded_error(state)
         raise ValueError(f"Budget exceeded: {error['message']}")
     
     # Check for graceful degradation
-    degradation_config = guardrail.get_degradation_config(state)
+    degradation_config = guardrail.get_degradation_config(state, action)
     if degradation_config:
         # Apply degradation (e.g., switch model, reduce context)
         if "model" in degradation_config:
@@ -245,8 +461,9 @@ def budget_aware_node(
     # Extract token usage (this would come from LLM response metadata)
     # In real implementation, this would be from the LLM SDK response
     model_name = kwargs.get("model", "unknown")
-    input_tokens = result.get("usage", {}).get("prompt_tokens", 0)
-    output_tokens = result.get("usage", {}).get("completion_tokens", 0)
+    usage = result.get("usage") or _EMPTY
+    input_tokens = usage.get("prompt_tokens", 0)
+    output_tokens = usage.get("completion_tokens", 0)
     
     # Update budget state
     state = cost_tracker.update_budget_state(
@@ -265,12 +482,96 @@ def budget_aware_node(
     return state
 
 
+def budget_aware_node_batch(
+    state: BudgetState,
+    cost_tracker: CostTracker,
+    guardrail: BudgetGuardrail,
+    node_name: str,
+    llm_call_batch_func,
+    requests: List[Dict[str, Any]]
+) -> BudgetState:
+    """
+    Batched variant of budget_aware_node for many small LLM calls.
+    
+    This demonstrates amortized guardrail enforcement:
+    - One halt/degradation check before the whole batch
+    - One vectorized budget update for all calls
+    - One halt check after the batch
+    
+    The batch is admitted as a unit, so it can overshoot the budget by up
+    to its own cost; use budget_aware_node when each call must be gated.
+    
+    Args:
+        state: Current graph state
+        cost_tracker: Cost tracker instance
+        guardrail: Budget guardrail instance
+        node_name: Name of the node
+        llm_call_batch_func: Function taking the list of request kwargs and
+            returning one result per request (with "usage" metadata)
+        requests: Keyword arguments for each LLM call
+        
+    Returns:
+        Updated state
+        
+    Raises:
+        BudgetExceededError: If budget is exceeded
+    """
+    # Check if we should halt (one decision, reused for degradation)
+    action = guardrail.check_guardrail(state)
+    if action == GuardrailAction.HALT:
+        error = guardrail.create_budget_exceeded_error(state)
+        raise ValueError(f"Budget exceeded: {error['message']}")
+    
+    # Apply graceful degradation to every request in the batch
+    degradation_config = guardrail.get_degradation_config(state, action)
+    if degradation_config:
+        requests = [{**request, **degradation_config} for request in requests]
+    
+    # Make LLM calls
+    results = llm_call_batch_func(requests)
+    
+    # Extract token usage per call (from LLM response metadata)
+    model_names = [request.get("model", "unknown") for request in requests]
+    usages = [result.get("usage") or _EMPTY for result in results]
+    input_tokens = np.fromiter(
+        (usage.get("prompt_tokens", 0) for usage in usages), dtype=np.int64, count=len(usages)
+    )
+    output_tokens = np.fromiter(
+        (usage.get("completion_tokens", 0) for usage in usages), dtype=np.int64, count=len(usages)
+    )
+    
+    # Update budget state once for the whole batch
+    state = cost_tracker.update_budget_state_batch(
+        state=state,
+        model_names=model_names,
+        node_name=node_name,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens
+    )
+    
+    # Check again after update (in case this batch exceeded budget)
+    if guardrail.should_halt(state):
+        error = guardrail.create_budget_exceeded_error(state)
+        raise ValueError(f"Budget exceeded: {error['message']}")
+    
+    return state
+
+
 # ============================================================================
 # Conditional Routing Example
 # ============================================================================
 
+# Next node per GuardrailAction, indexed by action value
+_ROUTE_TABLE = (
+    "normal_processing_node",    # CONTINUE
+    "normal_processing_node",    # WARN
+    "degraded_processing_node",  # DEGRADE
+    "halt_node",                 # HALT
+)
+
+
 def budget_aware_router(
-    state: BudgetState,
+    state: Mapping[str, Any],
     cost_tracker: 'CostTracker',
     guardrail: 'BudgetGuardrail'
 ) -> str:
@@ -290,21 +591,14 @@ def budget_aware_router(
     Returns:
         Next node name
     """
-    action = guardrail.check_guardrail(state)
-    
-    if action == GuardrailAction.HALT:
-        return "halt_node"
-    elif action == GuardrailAction.DEGRADE:
-        return "degraded_processing_node"
-    else:
-        return "normal_processing_node"
+    return _ROUTE_TABLE[guardrail.check_guardrail(state)]
 
 
 # ============================================================================
 # Pre-Call Budget Checking
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EstimatedCallCost:
     """
     Estimated cost for an upcoming LLM call.
@@ -321,7 +615,7 @@ class EstimatedCallCost:
 
 
 def check_budget_before_llm_call(
-    state: BudgetState,
+    state: Mapping[str, Any],
     cost_tracker: CostTracker,
     guardrail: BudgetGuardrail,
     estimated_call_cost: EstimatedCallCost
@@ -347,33 +641,54 @@ def check_budget_before_llm_call(
         - action: GuardrailAction to take
         - degradation_config: Config for degradation if needed
     """
-    # Get current budget status
-    current_status = cost_tracker.check_budget_status(state)
-    current_cost = current_status["budget_used"]
-    budget_limit = state.get("budget_limit_usd", 0)
-    
-    # Calculate projected cost after call
-    projected_cost = current_cost + estimated_call_cost.estimated_cost_usd
-    projected_usage_percent = projected_cost / budget_limit if budget_limit > 0 else 0.0
-    
-    # Create temporary state with projected cost for guardrail check
-    projected_state = state.copy()
-    projected_state["total_cost_usd"] = projected_cost
-    
-    # Check guardrail with projected cost
-    action = guardrail.check_guardrail(projected_state)
-    
-    # Determine if we can proceed
-    can_proceed = action != GuardrailAction.HALT
+    can_proceed, action = check_budget_before_llm_call_fast(
+        state, guardrail, estimated_call_cost.estimated_cost_usd
+    )
     
     # Get degradation config if needed
     degradation_config = None
     if action == GuardrailAction.DEGRADE:
-        degradation_config = guardrail.get_degradation_config(projected_state)
+        degradation_config = guardrail.get_degradation_config(state, action)
     
     return can_proceed, action, degradation_config
 
 
+def check_budget_before_llm_call_fast(
+    state: Mapping[str, Any],
+    guardrail: BudgetGuardrail,
+    estimated_cost_usd: float
+) -> tuple[bool, GuardrailAction]:
+    """
+    Pre-call budget check on a bare cost estimate.
+    
+    Same decision as check_budget_before_llm_call without building an
+    EstimatedCallCost or a degradation config; call
+    guardrail.get_degradation_config(state, action) when action is DEGRADE.
+    
+    Args:
+        state: Current budget state
+        guardrail: Budget guardrail instance
+        estimated_cost_usd: Estimated cost of the upcoming call (USD)
+    
+    Returns:
+        Tuple of (can_proceed, action)
+    """
+    try:
+        total, limit, warning, exceeded = _GET_BUDGET_FIELDS(state)
+    except KeyError:  # partially initialized state; use the defaults
+        total = state.get("total_cost_usd", 0.0)
+        limit = state.get("budget_limit_usd", guardrail.cost_tracker.budget_limit_usd)
+        warning = state.get("budget_warning_threshold")
+        exceeded = state.get("budget_exceeded", False)
+    
+    # Project current spend (what check_budget_status reports as
+    # budget_used) by the estimate; no need to copy the state
+    action = guardrail.check_guardrail_raw(
+        total + estimated_cost_usd, limit, warning_threshold=warning, exceeded=exceeded
+    )
+    return action != GuardrailAction.HALT, action
+
+
 # ============================================================================
 # Budget-Aware Worker Node Pattern
 # ============================================================================
@@ -396,6 +711,10 @@ def budget_aware_worker_node(
     - DO: Execute worker logic only if budget allows
     - WRITE: Update BudgetState after successful call
     
+    Errors are appended in place to state["errors"], which is treated as an
+    append-only list (like a LangGraph list reducer); do not share one list
+    between states that must not see each other's errors.
+    
     Args:
         state: GraphState (must contain BudgetState)
         cost_tracker: Cost tracker instance
@@ -418,6 +737,7 @@ def budget_aware_worker_node(
         budget_state = {
             "total_cost_usd": 0.0,
             "budget_limit_usd": kwargs.get("budget_limit_usd", 10.0),
+            "budget_warning_threshold": cost_tracker.warning_threshold,
             "budget_exceeded": False
         }
         state["budget"] = budget_state
@@ -427,29 +747,22 @@ def budget_aware_worker_node(
     # - Model being used
     # - Input context size
     # - Expected output length
-    estimated_cost = EstimatedCallCost(
-        model_name=kwargs.get("model", "gpt-4"),
-        estimated_input_tokens=kwargs.get("estimated_input_tokens", 1000),
-        estimated_output_tokens=kwargs.get("estimated_output_tokens", 500),
-        estimated_cost_usd=0.0  # Would be calculated from pricing
-    )
+    estimated_cost_usd = 0.0  # Would be calculated from pricing
     
     # Pre-call budget check
-    can_proceed, action, degradation_config = check_budget_before_llm_call(
-        state=budget_state,
-        cost_tracker=cost_tracker,
-        guardrail=guardrail,
-        estimated_call_cost=estimated_cost
+    can_proceed, action = check_budget_before_llm_call_fast(
+        budget_state, guardrail, estimated_cost_usd
     )
     
     # HALT if budget exceeded
     if not can_proceed:
         error = guardrail.create_budget_exceeded_error(budget_state)
-        state["errors"] = state.get("errors", []) + [error]
+        state.setdefault("errors", []).append(error)
         state["budget"]["budget_exceeded"] = True
         return state
     
     # Apply degradation if needed
+    degradation_config = guardrail.get_degradation_config(budget_state, action)
     if degradation_config:
         # Update kwargs with degradation config
         if "model" in degradation_config:
@@ -463,9 +776,11 @@ def budget_aware_worker_node(
         
         # Extract actual token usage from result
         # In real implementation, this comes from LLM response
-        actual_input_tokens = result.get("usage", {}).get("prompt_tokens", estimated_cost.estimated_input_tokens)
-        actual_output_tokens = result.get("usage", {}).get("completion_tokens", estimated_cost.estimated_output_tokens)
-        model_name = kwargs.get("model", estimated_cost.model_name)
+        # (falling back to the caller's estimates)
+        usage = result.get("usage") or _EMPTY
+        actual_input_tokens = usage.get("prompt_tokens", kwargs.get("estimated_input_tokens", 1000))
+        actual_output_tokens = usage.get("completion_tokens", kwargs.get("estimated_output_tokens", 500))
+        model_name = kwargs.get("model", "gpt-4")
         
         # WRITE: Update BudgetState
         updated_budget = cost_tracker.update_budget_state(
@@ -482,14 +797,14 @@ def budget_aware_worker_node(
         # Check again after actual call (in case estimation was off)
         if guardrail.should_halt(updated_budget):
             error = guardrail.create_budget_exceeded_error(updated_budget)
-            state["errors"] = state.get("errors", []) + [error]
+            state.setdefault("errors", []).append(error)
             state["budget"]["budget_exceeded"] = True
         
         return state
         
     except Exception as e:
         # Handle errors - don't update budget on failure
-        state["errors"] = state.get("errors", []) + [{"error": str(e), "node": node_name}]
+        state.setdefault("errors", []).append({"error": str(e), "node": node_name})
         return state
 
 
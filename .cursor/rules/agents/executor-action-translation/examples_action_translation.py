@@ -5,7 +5,8 @@ This file demonstrates plan-to-action translation patterns, action structure, an
 Reference this example from RULE.mdc using @examples_action_translation.py syntax.
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -24,7 +25,37 @@ class ActionType(str, Enum):
     WORKER_TASK = "worker_task"
 
 
-@dataclass
+# Substring -> action type, checked in order against the lowercased action name
+_TYPE_KEYWORDS: Tuple[Tuple[str, ActionType], ...] = (
+    ("api", ActionType.API_CALL),
+    ("tool", ActionType.TOOL_INVOCATION),
+    ("file", ActionType.FILE_OPERATION),
+    ("db", ActionType.DATABASE_OPERATION),
+    ("database", ActionType.DATABASE_OPERATION),
+    ("worker", ActionType.WORKER_TASK),
+)
+
+# Per-type timeouts (seconds) and validation rules, shared read-only by all actions
+_TIMEOUTS: Mapping[ActionType, int] = MappingProxyType({
+    ActionType.API_CALL: 30,
+    ActionType.TOOL_INVOCATION: 60,
+    ActionType.FILE_OPERATION: 10,
+    ActionType.DATABASE_OPERATION: 20,
+    ActionType.SYSTEM_COMMAND: 120,
+    ActionType.WORKER_TASK: 300
+})
+
+_VALIDATION_RULES: Mapping[ActionType, Tuple[str, ...]] = MappingProxyType({
+    ActionType.API_CALL: ("validate_url", "validate_parameters", "check_authentication"),
+    ActionType.TOOL_INVOCATION: ("validate_tool_exists", "validate_parameters"),
+    ActionType.FILE_OPERATION: ("validate_path", "check_permissions"),
+    ActionType.DATABASE_OPERATION: ("validate_query", "check_connection"),
+    ActionType.SYSTEM_COMMAND: ("validate_command", "check_permissions"),
+    ActionType.WORKER_TASK: ("validate_section", "check_worker_availability")
+})
+
+
+@dataclass(slots=True, frozen=True)
 class StrategicPlan:
     """Strategic plan from Planner."""
     plan_id: str
@@ -35,16 +66,16 @@ class StrategicPlan:
     resource_requirements: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ConcreteAction:
     """Concrete action ready for execution."""
     action_id: str
     action_type: ActionType
-    parameters: Dict[str, Any]
+    parameters: Dict[str, Any]  # Not copied on freeze; do not mutate after creation
     dependencies: List[str]
     retry_config: Optional[Dict[str, Any]] = None
     timeout: Optional[int] = None
-    validation_rules: Optional[List[str]] = None
+    validation_rules: Optional[Tuple[str, ...]] = None
 
 
 # ============================================================================
@@ -81,6 +112,12 @@ class ActionTranslationService:
         """
         actions = []
         
+        # Index risk assessments once instead of scanning them per action
+        # (the first assessment for an action wins, as with a linear scan)
+        risk_by_id: Dict[str, Dict[str, Any]] = {}
+        for risk in plan.risk_assessments:
+            risk_by_id.setdefault(risk.get("action_id"), risk)
+        
         for i, action_name in enumerate(plan.action_sequence):
             # Determine action type from plan
             action_type = self._determine_action_type(action_name, plan, context)
@@ -92,7 +129,7 @@ class ActionTranslationService:
             dependencies = plan.dependencies.get(action_name, [])
             
             # Get retry config from risk assessment
-            retry_config = self._get_retry_config(action_name, plan)
+            retry_config = self._get_retry_config(action_name, risk_by_id)
             
             # Create concrete action
             action = ConcreteAction(
@@ -123,18 +160,11 @@ class ActionTranslationService:
             Action type
         """
         # Simplified logic - in production would use more sophisticated determination
-        if "api" in action_name.lower():
-            return ActionType.API_CALL
-        elif "tool" in action_name.lower():
-            return ActionType.TOOL_INVOCATION
-        elif "file" in action_name.lower():
-            return ActionType.FILE_OPERATION
-        elif "db" in action_name.lower() or "database" in action_name.lower():
-            return ActionType.DATABASE_OPERATION
-        elif "worker" in action_name.lower():
-            return ActionType.WORKER_TASK
-        else:
-            return ActionType.API_CALL  # Default
+        name = action_name.lower()
+        for keyword, action_type in _TYPE_KEYWORDS:
+            if keyword in name:
+                return action_type
+        return ActionType.API_CALL  # Default
     
     def _extract_parameters(self, action_name: str, plan: StrategicPlan, 
                           context: Dict[str, Any]) -> Dict[str, Any]:
@@ -159,31 +189,32 @@ class ActionTranslationService:
         
         return parameters
     
-    def _get_retry_config(self, action_name: str, plan: StrategicPlan) -> Optional[Dict[str, Any]]:
+    def _get_retry_config(self, action_name: str,
+                          risk_by_id: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """
         Get retry configuration from risk assessment.
         
         Args:
             action_name: Name of the action
-            plan: Strategic plan
+            risk_by_id: Plan risk assessments indexed by action_id
             
         Returns:
             Retry configuration or None
         """
         # Find risk assessment for this action
-        for risk in plan.risk_assessments:
-            if risk.get("action_id") == action_name:
-                risk_level = risk.get("risk_level", "medium")
-                
-                # Configure retry based on risk
-                if risk_level == "high":
-                    return {"max_attempts": 3, "backoff": "exponential", "base_delay": 2}
-                elif risk_level == "medium":
-                    return {"max_attempts": 2, "backoff": "linear", "base_delay": 1}
-                else:
-                    return {"max_attempts": 1}
+        risk = risk_by_id.get(action_name)
+        if risk is None:
+            return None
+        
+        risk_level = risk.get("risk_level", "medium")
         
-        return None
+        # Configure retry based on risk
+        if risk_level == "high":
+            return {"max_attempts": 3, "backoff": "exponential", "base_delay": 2}
+        elif risk_level == "medium":
+            return {"max_attempts": 2, "backoff": "linear", "base_delay": 1}
+        else:
+            return {"max_attempts": 1}
     
     def _get_timeout(self, action_type: ActionType) -> Optional[int]:
         """
@@ -195,17 +226,9 @@ class ActionTranslationService:
         Returns:
             Timeout in seconds or None
         """
-        timeouts = {
-            ActionType.API_CALL: 30,
-            ActionType.TOOL_INVOCATION: 60,
-            ActionType.FILE_OPERATION: 10,
-            ActionType.DATABASE_OPERATION: 20,
-            ActionType.SYSTEM_COMMAND: 120,
-            ActionType.WORKER_TASK: 300
-        }
-        return timeouts.get(action_type)
+        return _TIMEOUTS.get(action_type)
     
-    def _get_validation_rules(self, action_type: ActionType) -> List[str]:
+    def _get_validation_rules(self, action_type: ActionType) -> Tuple[str, ...]:
         """
         Get validation rules for action type.
         
@@ -213,17 +236,9 @@ class ActionTranslationService:
             action_type: Type of action
             
         Returns:
-            List of validation rules
+            Tuple of validation rules (shared; not copied per action)
         """
-        rules = {
-            ActionType.API_CALL: ["validate_url", "validate_parameters", "check_authentication"],
-            ActionType.TOOL_INVOCATION: ["validate_tool_exists", "validate_parameters"],
-            ActionType.FILE_OPERATION: ["validate_path", "check_permissions"],
-            ActionType.DATABASE_OPERATION: ["validate_query", "check_connection"],
-            ActionType.SYSTEM_COMMAND: ["validate_command", "check_permissions"],
-            ActionType.WORKER_TASK: ["validate_section", "check_worker_availability"]
-        }
-        return rules.get(action_type, [])
+        return _VALIDATION_RULES.get(action_type, ())
     
     def validate_action(self, action: ConcreteAction) -> Tuple[bool, List[str]]:
         """
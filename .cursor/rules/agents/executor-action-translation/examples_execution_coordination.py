@@ -5,14 +5,20 @@ This file demonstrates coordination patterns with Workers and Tools, parallel ex
 Reference this example from RULE.mdc using @examples_execution_coordination.py syntax.
 """
 
+import asyncio
+import hashlib
 import json
 import logging
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional, Set
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Set, Tuple
+from dataclasses import dataclass, replace
 from enum import Enum
-from collections import defaultdict, deque
+from collections import OrderedDict, deque
+
+import numpy as np
 
 # See @examples_performance_timing in monitoring-and-observability for full implementation.
 logger = logging.getLogger(__name__)
@@ -25,17 +31,18 @@ class PerformanceTimer:
         self.operation_name = operation_name
         self.extra = extra
         self.duration_seconds: float = 0.0
-        self._start: float = 0.0
+        self._start_ns: int = 0
         self._start_ts: str = ""
 
     def __enter__(self) -> "PerformanceTimer":
-        self._start = time.perf_counter()
+        self._start_ns = time.perf_counter_ns()
         self._start_ts = datetime.now(timezone.utc).isoformat()
         return self
 
     def __exit__(self, *args: Any) -> None:
         end_ts = datetime.now(timezone.utc).isoformat()
-        self.duration_seconds = time.perf_counter() - self._start
+        # Integer nanosecond delta; converted to seconds once
+        self.duration_seconds = (time.perf_counter_ns() - self._start_ns) * 1e-9
         duration_ms = self.duration_seconds * 1000
         log_data = {
             "timestamp": end_ts,
@@ -52,17 +59,26 @@ class PerformanceTimer:
 # Execution Coordination Types
 # ============================================================================
 
-@dataclass
+# Estimated run time (seconds) for actions without parameters["estimated_time"]
+_DEFAULT_ESTIMATED_TIME = 10
+
+@dataclass(slots=True, frozen=True)
 class ConcreteAction:
     """Concrete action ready for execution."""
     action_id: str
     action_type: str
-    parameters: Dict[str, Any]
+    parameters: Dict[str, Any]  # Not copied on freeze; do not mutate after creation
     dependencies: List[str]
     worker_id: Optional[str] = None
+    tier: int = 0  # Dependency depth, if assigned at translation time
+    
+    def __post_init__(self):
+        """Intern the id and type, which are used as dict keys throughout."""
+        object.__setattr__(self, "action_id", sys.intern(self.action_id))
+        object.__setattr__(self, "action_type", sys.intern(self.action_type))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ActionResult:
     """Result from action execution."""
     action_id: str
@@ -72,7 +88,7 @@ class ActionResult:
     execution_time: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExecutionPlan:
     """Execution plan with sequencing."""
     sequential_actions: List[List[ConcreteAction]]  # Each inner list can run in parallel
@@ -80,6 +96,10 @@ class ExecutionPlan:
     estimated_time: float
 
 
+class CycleDetectedError(ValueError):
+    """Raised when action dependencies form a cycle and cannot be sequenced."""
+
+
 class ExecutionStatus(str, Enum):
     """Execution status."""
     PENDING = "pending"
@@ -104,6 +124,37 @@ class ExecutionCoordinationService:
     - Result collection
     """
     
+    # Number of plan layouts kept for replayed action sets (LRU)
+    PLAN_CACHE_SIZE = 128
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize execution coordination service.
+        
+        Args:
+            max_workers: Size of the shared action thread pool; defaults to
+                context["max_workers"] (or 8) when the pool is first needed
+        """
+        self._max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        
+        # Dependency fingerprint -> execution groups as indices into the actions
+        self._plan_cache: "OrderedDict[bytes, Tuple[Tuple[int, ...], ...]]" = OrderedDict()
+    
+    def _get_pool(self, context: Dict[str, Any]) -> ThreadPoolExecutor:
+        """Return the shared thread pool, creating it on first use."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._max_workers or context.get("max_workers", 8)
+            )
+        return self._pool
+    
+    def close(self) -> None:
+        """Shut down the shared thread pool (waits for running actions)."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+    
     def create_execution_plan(self, actions: List[ConcreteAction]) -> ExecutionPlan:
         """
         Create execution plan with dependency management.
@@ -113,23 +164,34 @@ class ExecutionCoordinationService:
         - Sequential vs parallel grouping
         - Execution sequencing
         
+        Actions with precomputed tiers (any tier > 0) are grouped by tier
+        directly when every in-plan dependency sits in a lower tier;
+        otherwise groups come from a topological sort.
+        
         Args:
             actions: List of actions to execute
             
         Returns:
             Execution plan with sequencing
+            
+        Raises:
+            CycleDetectedError: If action dependencies form a cycle
         """
-        # Build dependency graph
-        dependency_graph = self._build_dependency_graph(actions)
-        
-        # Topological sort to determine execution order
-        execution_groups = self._topological_sort(actions, dependency_graph)
-        
-        # Calculate estimated time
-        estimated_time = sum(
-            max(action.parameters.get("estimated_time", 10) for action in group)
-            for group in execution_groups
-        )
+        # Group actions and sum each group's slowest estimate in the same pass
+        if any(action.tier for action in actions) and self._tiers_consistent(actions):
+            # Tiers were assigned at translation time: group by tier, O(V)
+            n_tiers = max(action.tier for action in actions) + 1
+            by_tier: List[List[ConcreteAction]] = [[] for _ in range(n_tiers)]
+            tier_max = [0] * n_tiers
+            for action in actions:
+                by_tier[action.tier].append(action)
+                est = action.parameters.get("estimated_time", _DEFAULT_ESTIMATED_TIME)
+                if est > tier_max[action.tier]:
+                    tier_max[action.tier] = est
+            execution_groups = [group for group in by_tier if group]
+            estimated_time = sum(tier_max)
+        else:
+            execution_groups, estimated_time = self._sorted_groups(actions)
         
         plan = ExecutionPlan(
             sequential_actions=execution_groups,
@@ -139,70 +201,187 @@ class ExecutionCoordinationService:
         
         return plan
     
-    def _build_dependency_graph(self, actions: List[ConcreteAction]) -> Dict[str, Set[str]]:
+    @staticmethod
+    def _tiers_consistent(actions: List[ConcreteAction]) -> bool:
+        """
+        Check that precomputed tiers respect the dependencies.
+        
+        Args:
+            actions: List of actions
+            
+        Returns:
+            True if every tier is non-negative and every dependency inside
+            the list has a strictly lower tier than its dependent
+        """
+        tier_of = {action.action_id: action.tier for action in actions}
+        for action in actions:
+            if action.tier < 0:
+                return False
+            for dep_id in action.dependencies:
+                dep_tier = tier_of.get(dep_id)
+                if dep_tier is not None and dep_tier >= action.tier:
+                    return False
+        return True
+    
+    def _sorted_groups(
+        self, actions: List[ConcreteAction]
+    ) -> Tuple[List[List[ConcreteAction]], int]:
+        """
+        Group actions by dependency level, reusing cached layouts.
+        
+        Replayed/retried plans have the same ids and dependencies, so the
+        grouping is cached by that fingerprint. It is stored as positions so
+        the groups are always built from the actions passed in this call.
+        
+        Args:
+            actions: List of actions
+            
+        Returns:
+            Tuple of (action groups, estimated time): each group can run in
+            parallel, and the estimate sums each group's slowest action
+        """
+        key = self._plan_key(actions)
+        layout = self._plan_cache.get(key)
+        if layout is not None:
+            self._plan_cache.move_to_end(key)
+            execution_groups = []
+            estimated_time = 0
+            for positions in layout:
+                group = [actions[i] for i in positions]
+                execution_groups.append(group)
+                estimated_time += max(
+                    action.parameters.get("estimated_time", _DEFAULT_ESTIMATED_TIME)
+                    for action in group
+                )
+            return execution_groups, estimated_time
+        
+        # Build dependency graph (both edge directions)
+        prereqs, dependents = self._build_dependency_graph(actions)
+        
+        # Topological sort to determine execution order
+        execution_groups, estimated_time = self._topological_sort(actions, prereqs, dependents)
+        
+        position = {action.action_id: i for i, action in enumerate(actions)}
+        self._plan_cache[key] = tuple(
+            tuple(position[action.action_id] for action in group)
+            for group in execution_groups
+        )
+        if len(self._plan_cache) > self.PLAN_CACHE_SIZE:
+            self._plan_cache.popitem(last=False)
+        
+        return execution_groups, estimated_time
+    
+    @staticmethod
+    def _plan_key(actions: List[ConcreteAction]) -> bytes:
+        """
+        Fingerprint of the action ids and dependencies, in input order.
+        
+        Args:
+            actions: List of actions
+            
+        Returns:
+            Digest identifying the dependency structure
+        """
+        return hashlib.blake2b(
+            repr([(action.action_id, tuple(action.dependencies)) for action in actions]).encode(),
+            digest_size=16
+        ).digest()
+    
+    def _build_dependency_graph(
+        self, actions: List[ConcreteAction]
+    ) -> Tuple[Dict[str, Set[str]], Dict[str, List[str]]]:
         """
         Build dependency graph from actions.
         
+        Dependencies on actions outside the list are ignored.
+        
         Args:
             actions: List of actions
             
         Returns:
-            Dependency graph (action_id -> set of dependent action_ids)
+            Tuple of (prereqs, dependents), with no entry for an action that
+            has no prerequisites or no dependents respectively:
+            - prereqs: action_id -> set of action_ids it depends on
+            - dependents: action_id -> action_ids that depend on it
         """
-        graph = defaultdict(set)
-        action_map = {action.action_id: action for action in actions}
+        prereqs: Dict[str, Set[str]] = {}
+        dependents: Dict[str, List[str]] = {}
+        action_ids = {action.action_id for action in actions}
         
         for action in actions:
+            deps = prereqs.get(action.action_id)
             for dep_id in action.dependencies:
-                if dep_id in action_map:
-                    graph[action.action_id].add(dep_id)
-        
-        return dict(graph)
+                if dep_id not in action_ids:
+                    continue
+                if deps is None:
+                    deps = prereqs[action.action_id] = set()
+                elif dep_id in deps:
+                    continue
+                deps.add(dep_id)
+                dependents.setdefault(dep_id, []).append(action.action_id)
+        
+        return prereqs, dependents
     
     def _topological_sort(self, actions: List[ConcreteAction], 
-                         dependency_graph: Dict[str, Set[str]]) -> List[List[ConcreteAction]]:
+                         prereqs: Dict[str, Set[str]],
+                         dependents: Dict[str, List[str]]
+                         ) -> Tuple[List[List[ConcreteAction]], int]:
         """
         Topological sort to group actions by execution level.
         
         Args:
             actions: List of actions
-            dependency_graph: Dependency graph
+            prereqs: action_id -> set of action_ids it depends on
+            dependents: action_id -> action_ids that depend on it
             
         Returns:
-            List of action groups (each group can run in parallel)
+            Tuple of (action groups, estimated time): each group can run in
+            parallel, and the estimate sums each group's slowest action
+            
+        Raises:
+            CycleDetectedError: If some actions can never become ready
         """
+        # Counters stay in a local dict: actions are frozen and may be shared
+        # between plans (and cached layouts), so they cannot carry run state
         action_map = {action.action_id: action for action in actions}
-        in_degree = {action.action_id: 0 for action in actions}
-        
-        # Calculate in-degrees
-        for action in actions:
-            for dep_id in dependency_graph.get(action.action_id, set()):
-                if dep_id in in_degree:
-                    in_degree[action.action_id] += 1
+        in_degree = {action_id: len(prereqs.get(action_id, ())) for action_id in action_map}
         
-        # Topological sort
+        # Kahn's algorithm, one level per pass: O(V + E)
         execution_groups = []
-        queue = deque([action_id for action_id, degree in in_degree.items() if degree == 0])
+        estimated_time = 0
+        placed = 0
+        queue = deque(action_id for action_id, degree in in_degree.items() if degree == 0)
         
         while queue:
             current_level = []
             level_size = len(queue)
+            level_max = 0
             
             for _ in range(level_size):
                 action_id = queue.popleft()
-                current_level.append(action_map[action_id])
+                action = action_map[action_id]
+                current_level.append(action)
+                est = action.parameters.get("estimated_time", _DEFAULT_ESTIMATED_TIME)
+                if est > level_max:
+                    level_max = est
                 
                 # Update in-degrees of dependent actions
-                for dependent_id in dependency_graph.get(action_id, set()):
-                    if dependent_id in in_degree:
-                        in_degree[dependent_id] -= 1
-                        if in_degree[dependent_id] == 0:
-                            queue.append(dependent_id)
+                for dependent_id in dependents.get(action_id, ()):
+                    remaining = in_degree[dependent_id] - 1
+                    in_degree[dependent_id] = remaining
+                    if remaining == 0:
+                        queue.append(dependent_id)
             
-            if current_level:
-                execution_groups.append(current_level)
+            execution_groups.append(current_level)
+            estimated_time += level_max
+            placed += level_size
+        
+        # Actions on (or behind) a dependency cycle never reach in-degree 0
+        if placed < len(action_map):
+            blocked = sorted(action_id for action_id, degree in in_degree.items() if degree > 0)
+            raise CycleDetectedError(f"Dependency cycle among actions: {blocked}")
         
-        return execution_groups
+        return execution_groups, estimated_time
     
     def coordinate_parallel_execution(self, action_group: List[ConcreteAction], 
                                      context: Dict[str, Any]) -> List[ActionResult]:
@@ -221,19 +400,35 @@ class ExecutionCoordinationService:
         Returns:
             List of action results
         """
-        import asyncio
-        
-        async def execute_action_async(action: ConcreteAction) -> ActionResult:
-            """Execute single action asynchronously."""
-            return self._execute_action(action, context)
+        if len(action_group) <= 1:
+            return [self._execute_action(action, context) for action in action_group]
+        
+        # Actions are I/O-bound (LLM, API, worker calls), so running them on
+        # the shared pool lets a group finish in about the time of its slowest
+        # action; the pool is reused across groups instead of rebuilt per group
+        pool = self._get_pool(context)
+        futures = [pool.submit(self._execute_action, action, context) for action in action_group]
+        return [future.result() for future in futures]
+    
+    async def coordinate_parallel_execution_async(self, action_group: List[ConcreteAction], 
+                                                  context: Dict[str, Any]) -> List[ActionResult]:
+        """
+        Coordinate parallel execution of action group from async code.
         
-        # Execute all actions in parallel
-        loop = asyncio.get_event_loop()
-        results = loop.run_until_complete(
-            asyncio.gather(*[execute_action_async(action) for action in action_group])
-        )
+        Runs each blocking action in a worker thread and gathers the results
+        without blocking the running event loop.
         
-        return results
+        Args:
+            action_group: Group of actions to execute in parallel
+            context: Execution context
+            
+        Returns:
+            List of action results
+        """
+        return list(await asyncio.gather(*[
+            asyncio.to_thread(self._execute_action, action, context)
+            for action in action_group
+        ]))
     
     def coordinate_sequential_execution(self, action_groups: List[List[ConcreteAction]], 
                                       context: Dict[str, Any]) -> List[ActionResult]:
@@ -253,6 +448,7 @@ class ExecutionCoordinationService:
             List of all action results
         """
         all_results = []
+        stop_on_failure = self._should_stop_on_failure(context)  # fixed for the run
         
         for group in action_groups:
             # Execute group in parallel
@@ -260,12 +456,76 @@ class ExecutionCoordinationService:
             all_results.extend(group_results)
             
             # Check for failures that might affect subsequent groups
-            failures = [r for r in group_results if not r.success]
-            if failures and self._should_stop_on_failure(context):
+            if stop_on_failure and not all(r.success for r in group_results):
                 break
         
         return all_results
     
+    async def coordinate_dag_execution_async(self, actions: List[ConcreteAction],
+                                             context: Dict[str, Any]) -> List[ActionResult]:
+        """
+        Execute actions straight from the dependency graph from async code.
+        
+        Unlike group-by-group execution, each action starts as soon as its own
+        prerequisites have finished, so a slow action delays only its
+        dependents instead of the whole next group. At most max_workers
+        actions run at once.
+        
+        Args:
+            actions: Actions to execute (dependencies outside the list are ignored)
+            context: Execution context
+            
+        Returns:
+            List of action results, in completion order
+            
+        Raises:
+            CycleDetectedError: If some actions can never become ready (raised
+                once every runnable action has finished)
+        """
+        prereqs, dependents = self._build_dependency_graph(actions)
+        action_map = {action.action_id: action for action in actions}
+        in_degree = {action_id: len(prereqs.get(action_id, ())) for action_id in action_map}
+        limit = self._max_workers or context.get("max_workers", 8)
+        stop_on_failure = self._should_stop_on_failure(context)  # fixed for the run
+        
+        ready = deque(action_id for action_id, degree in in_degree.items() if degree == 0)
+        running: Dict[asyncio.Task, str] = {}
+        results: List[ActionResult] = []
+        stopped = False
+        
+        while ready or running:
+            # Top up to the concurrency limit; nothing new starts after a stop
+            while ready and len(running) < limit and not stopped:
+                action_id = ready.popleft()
+                task = asyncio.create_task(
+                    asyncio.to_thread(self._execute_action, action_map[action_id], context)
+                )
+                running[task] = action_id
+            if not running:
+                break
+            
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                action_id = running.pop(task)
+                result = task.result()
+                results.append(result)
+                if not result.success and stop_on_failure:
+                    stopped = True
+                
+                # Release dependents whose last prerequisite just finished
+                for dependent_id in dependents.get(action_id, ()):
+                    remaining = in_degree[dependent_id] - 1
+                    in_degree[dependent_id] = remaining
+                    if remaining == 0:
+                        ready.append(dependent_id)
+        
+        # Actions on (or behind) a dependency cycle never reach in-degree 0
+        if not stopped and len(results) < len(action_map):
+            blocked = sorted(action_id for action_id, degree in in_degree.items() if degree > 0)
+            raise CycleDetectedError(f"Dependency cycle among actions: {blocked}")
+        
+        return results
+    
     def dispatch_to_worker(self, action: ConcreteAction, worker_id: str, 
                           context: Dict[str, Any]) -> ActionResult:
         """
@@ -284,8 +544,8 @@ class ExecutionCoordinationService:
         Returns:
             Action result from worker
         """
-        # Set worker ID in action
-        action.worker_id = worker_id
+        # Set worker ID in action (actions are frozen, so dispatch a copy)
+        action = replace(action, worker_id=worker_id)
         
         # Dispatch to worker (simplified - in production would use actual worker communication)
         result = self._execute_action(action, context)
@@ -307,17 +567,22 @@ class ExecutionCoordinationService:
         Returns:
             Aggregated results
         """
-        successful = [r for r in results if r.success]
-        failed = [r for r in results if not r.success]
+        # Pull the two numeric columns once and aggregate them in NumPy;
+        # only the failed results are materialized as a list
+        n = len(results)
+        times = np.fromiter((r.execution_time for r in results), dtype=np.float64, count=n)
+        success_mask = np.fromiter((r.success for r in results), dtype=bool, count=n)
+        failed = [r for r, ok in zip(results, success_mask) if not ok]
+        successful = int(success_mask.sum())
         
-        total_time = sum(r.execution_time for r in results)
-        avg_time = total_time / len(results) if results else 0
+        total_time = float(times.sum())
+        avg_time = float(times.mean()) if n else 0.0
         
         aggregated = {
             "total_actions": len(results),
-            "successful": len(successful),
+            "successful": successful,
             "failed": len(failed),
-            "success_rate": len(successful) / len(results) if results else 0,
+            "success_rate": successful / n if n else 0,
             "total_execution_time": total_time,
             "average_execution_time": avg_time,
             "results": results,
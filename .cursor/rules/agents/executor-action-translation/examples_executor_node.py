@@ -7,9 +7,10 @@ Reference this example from RULE.mdc using @examples_executor_node.py syntax.
 
 import json
 import logging
+import sys
 import time
 from datetime import datetime, timezone
-from typing import TypedDict, List, Dict, Any, Optional
+from typing import TypedDict, Callable, List, Dict, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
 
@@ -24,17 +25,18 @@ class PerformanceTimer:
         self.operation_name = operation_name
         self.extra = extra
         self.duration_seconds: float = 0.0
-        self._start: float = 0.0
+        self._start_ns: int = 0
         self._start_ts: str = ""
 
     def __enter__(self) -> "PerformanceTimer":
-        self._start = time.perf_counter()
+        self._start_ns = time.perf_counter_ns()
         self._start_ts = datetime.now(timezone.utc).isoformat()
         return self
 
     def __exit__(self, *args: Any) -> None:
         end_ts = datetime.now(timezone.utc).isoformat()
-        self.duration_seconds = time.perf_counter() - self._start
+        # Integer nanosecond delta; converted to seconds once
+        self.duration_seconds = (time.perf_counter_ns() - self._start_ns) * 1e-9
         duration_ms = self.duration_seconds * 1000
         log_data = {
             "timestamp": end_ts,
@@ -51,7 +53,7 @@ class PerformanceTimer:
 # Executor Node State Types
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StrategicPlan:
     """Strategic plan from Planner."""
     plan_id: str
@@ -60,17 +62,23 @@ class StrategicPlan:
     dependencies: Dict[str, List[str]]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ConcreteAction:
     """Concrete action ready for execution."""
     action_id: str
     action_type: str  # api_call, tool_invocation, file_operation, etc.
-    parameters: Dict[str, Any]
+    parameters: Dict[str, Any]  # Not copied on freeze; do not mutate after creation
     dependencies: List[str]
     retry_config: Optional[Dict[str, Any]] = None
+    tier: int = 0  # Dependency depth; actions of one tier can run in parallel
+    
+    def __post_init__(self):
+        """Intern the id and type, which are used as dict keys throughout."""
+        object.__setattr__(self, "action_id", sys.intern(self.action_id))
+        object.__setattr__(self, "action_type", sys.intern(self.action_type))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ActionResult:
     """Result from action execution."""
     action_id: str
@@ -80,7 +88,7 @@ class ActionResult:
     execution_time: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionStatus:
     """Execution status for monitoring."""
     status: str  # pending, in_progress, completed, failed
@@ -117,7 +125,12 @@ class ExecutorNode:
     
     def __init__(self):
         """Initialize Executor node."""
-        pass
+        # Action type -> handler; register new action types here
+        self._handlers: Dict[str, Callable[[ConcreteAction, Dict[str, Any]], Dict[str, Any]]] = {
+            "api_call": self._do_api,
+            "tool_invocation": self._do_tool,
+            "worker_task": self._do_worker,
+        }
     
     def executor_node(self, state: ExecutorState) -> ExecutorState:
         """
@@ -171,14 +184,43 @@ class ExecutorNode:
         - Action conversion
         - Parameter extraction
         - Dependency mapping
+        - Tier assignment (computed once here, so execution can group
+          actions by tier instead of sorting the dependency graph)
         """
+        # Dependencies name plan actions; map them to the generated action ids
+        # so execution can match them (the first action with a name wins;
+        # names outside the plan are kept as is)
+        ids: Dict[str, str] = {}
+        for i, action_name in enumerate(plan.action_sequence):
+            ids.setdefault(action_name, f"action_{i+1}")
+        
+        # When action_sequence lists prerequisites before their dependents,
+        # each action's tier is known from the tiers already assigned. A
+        # prerequisite listed later (or a cycle) leaves every tier at 0, so
+        # execution falls back to sorting the dependency graph.
+        dependencies = [
+            [ids.get(dep, dep) for dep in plan.dependencies.get(action_name, [])]
+            for action_name in plan.action_sequence
+        ]
+        in_plan = set(ids.values())
+        tiers: Optional[Dict[str, int]] = {}
+        for i, deps in enumerate(dependencies):
+            if any(dep in in_plan and dep not in tiers for dep in deps):
+                tiers = None
+                break
+            tiers[f"action_{i+1}"] = 1 + max(
+                (tiers[dep] for dep in deps if dep in tiers), default=-1
+            )
+        
         actions = []
         for i, action_name in enumerate(plan.action_sequence):
+            action_id = f"action_{i+1}"
             action = ConcreteAction(
-                action_id=f"action_{i+1}",
+                action_id=action_id,
                 action_type="api_call",  # Would be determined from plan
                 parameters={"name": action_name, "context": context},
-                dependencies=plan.dependencies.get(action_name, [])
+                dependencies=dependencies[i],
+                tier=tiers[action_id] if tiers is not None else 0
             )
             actions.append(action)
         return actions
@@ -268,14 +310,10 @@ class ExecutorNode:
             correlation_id=correlation_id or "",
         ) as timer:
             try:
-                if action.action_type == "api_call":
-                    result_data = {"status": "success", "data": "mock_result"}
-                elif action.action_type == "tool_invocation":
-                    result_data = {"tool_result": "mock_tool_output"}
-                elif action.action_type == "worker_task":
-                    result_data = {"worker_output": "mock_worker_result"}
-                else:
+                handler = self._handlers.get(action.action_type)
+                if handler is None:
                     raise ValueError(f"Unknown action type: {action.action_type}")
+                result_data = handler(action, context)
                 success = True
             except Exception as e:
                 error_msg = str(e)
@@ -287,3 +325,15 @@ class ExecutorNode:
             error=error_msg,
             execution_time=timer.duration_seconds,
         )
+    
+    def _do_api(self, action: ConcreteAction, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute an API call action (simplified)."""
+        return {"status": "success", "data": "mock_result"}
+    
+    def _do_tool(self, action: ConcreteAction, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a tool invocation action (simplified)."""
+        return {"tool_result": "mock_tool_output"}
+    
+    def _do_worker(self, action: ConcreteAction, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a worker task action (simplified)."""
+        return {"worker_output": "mock_worker_result"}